@@ -5,14 +5,40 @@ Chess Bot Configuration
 # Search Configuration
 SEARCH_DEPTH = 10  # Default search depth
 SEARCH_TIME = 1.0  # Default search time (seconds)
+ASPIRATION_WINDOW = 50  # Initial half-width of the aspiration window
+ASPIRATION_MAX_WINDOW = 400  # Widest window before a full-window search
+ASPIRATION_MIN_DEPTH = 4  # First iteration to use an aspiration window
+NULL_MOVE_MIN_DEPTH = 3  # Shallowest depth to try a null move
+NULL_MOVE_REDUCTION = 2  # Base reduction, grows by one every 4 plies of depth
+NULL_MOVE_VERIFY_DEPTH = 8  # Verify null move cutoffs from this depth
+LMR_MIN_DEPTH = 3  # Shallowest depth to reduce late moves
+LMR_MIN_MOVES = 3  # Moves searched at full depth before reducing
+LMR_BASE = 0.75  # Reduction = base + log(depth) * log(move number) / divisor
+LMR_DIVISOR = 2.25
+LMR_HISTORY_DIVISOR = 8192  # History score worth one ply of reduction
+REVERSE_FUTILITY_DEPTH = 3  # Deepest node cut on static eval above beta
+REVERSE_FUTILITY_MARGIN = 120  # Margin per ply of depth
+FUTILITY_DEPTH = 3  # Deepest node skipping quiet moves below alpha
+FUTILITY_MARGIN = 150  # Margin per ply of depth
+RAZOR_DEPTH = 2  # Deepest node dropping into quiescence below alpha
+RAZOR_MARGIN = 300  # Margin per ply of depth
 
-# Transposition Table
-TRANSPOSITION_TABLE_SIZE = 1024 * 1024  # 1M entries
+# Time Management
+MOVE_OVERHEAD = 30  # Milliseconds reserved per move for communication lag
+TIME_MOVES_TO_GO = 30  # Moves the clock is budgeted over without movestogo
+TIME_HARD_FACTOR = 5.0  # Hard limit as a multiple of the soft limit
+TIME_MAX_SHARE = 0.8  # Largest share of the remaining clock for one move
+TIME_MIN = 0.01  # Shortest limit (seconds)
+TIME_STABLE_STEP = 0.15  # Soft limit shrink per iteration with the same best move
+TIME_STABLE_MIN_SCALE = 0.4  # Smallest soft limit scale for a stable best move
+TIME_CHECK_NODES = 256  # Nodes between clock checks, a power of two
 
 # Evaluation Weights
 MATERIAL_WEIGHT = 1.0
 POSITION_WEIGHT = 1.0
 MOBILITY_WEIGHT = 0.1
+# Per-square mobility weight: pawn, knight, bishop, rook, queen, king
+MOBILITY_PIECE_WEIGHTS = [1, 1, 1, 1, 1, 1]
 KING_SAFETY_WEIGHT = 0.5
 PAWN_STRUCTURE_WEIGHT = 0.3
 
@@ -34,6 +60,9 @@ UCI_HASH = 128  # Hash table size in MB
 UCI_THREADS = 4  # Number of threads
 UCI_SKILL_LEVEL = 10  # 0-20
 
+# Perft
+PERFT_HASH = 16  # Perft hash table size in MB per process, 0 to disable
+
 # Logging
 LOG_LEVEL = "INFO"  # DEBUG, INFO, WARNING, ERROR
 LOG_FILE = "bot.log"
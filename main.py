@@ -28,8 +28,12 @@ def main():
         command = ' '.join(sys.argv[1:])
         if command == "uci":
             engine.run()
+        elif sys.argv[1] == "go" and ("infinite" in sys.argv or "ponder" in sys.argv):
+            # Nothing could send stop or ponderhit to a one-shot search
+            print("go infinite and go ponder need UCI or interactive mode")
         else:
             engine.handle_command(command)
+            engine.wait()
     else:
         # Interactive mode
         print("ChessBot Interactive Mode")
@@ -72,7 +76,9 @@ ChessBot Commands:
   position startpos moves <move1> <move2> ...
   go depth <d>     Search to depth d
   go movetime <ms> Search for ms milliseconds
-  stop             Stop search
+  go perft <d>     Count leaf nodes to depth d, per root move
+  go infinite      Search until stop (not from the command line)
+  stop             Stop search and print bestmove
   quit             Exit engine
   debug on/off     Enable/disable debug mode
   setoption name <name> value <value>
@@ -12,7 +12,7 @@ from src.position import Position
 from src.movegen import MoveGenerator
 from src.search import Search
 from src.evaluation import Evaluator
-from src.type_defs.chess_types import Square, Color, Move
+from src.type_defs.chess_types import Square, Color, Move, move_to_uci
 
 def print_board(pos):
     """Print the chess board"""
@@ -107,13 +107,10 @@ def play_game():
                     print("Invalid move! Enter move like 'e2e4'")
                     continue
 
-                from_sq = Square.from_string(move_str[0:2])
-                to_sq = Square.from_string(move_str[2:4])
-
                 # Check if move is legal
                 legal_move = None
                 for move in moves:
-                    if str(move.from_sq) == move_str[0:2] and str(move.to_sq) == move_str[2:4]:
+                    if move_to_uci(move)[0:4] == move_str[0:4]:
                         legal_move = move
                         break
 
@@ -0,0 +1,59 @@
+"""
+Bitboard module
+"""
+
+from .bitboard import (
+    FULL,
+    FILE_A,
+    FILE_H,
+    RANK_1,
+    RANK_8,
+    SQUARE_BB,
+    FILE_BB,
+    RANK_BB,
+    ADJACENT_FILES_BB,
+    KNIGHT_ATTACKS,
+    KING_ATTACKS,
+    PAWN_ATTACKS,
+    ROOK_MASKS,
+    BISHOP_MASKS,
+    ROOK_TABLES,
+    BISHOP_TABLES,
+    rook_attacks,
+    bishop_attacks,
+    queen_attacks,
+    BETWEEN_BB,
+    LINE_BB,
+    lsb,
+    msb,
+    popcount,
+    iter_squares,
+)
+
+__all__ = [
+    "FULL",
+    "FILE_A",
+    "FILE_H",
+    "RANK_1",
+    "RANK_8",
+    "SQUARE_BB",
+    "FILE_BB",
+    "RANK_BB",
+    "ADJACENT_FILES_BB",
+    "KNIGHT_ATTACKS",
+    "KING_ATTACKS",
+    "PAWN_ATTACKS",
+    "ROOK_MASKS",
+    "BISHOP_MASKS",
+    "ROOK_TABLES",
+    "BISHOP_TABLES",
+    "rook_attacks",
+    "bishop_attacks",
+    "queen_attacks",
+    "BETWEEN_BB",
+    "LINE_BB",
+    "lsb",
+    "msb",
+    "popcount",
+    "iter_squares",
+]
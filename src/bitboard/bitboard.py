@@ -0,0 +1,189 @@
+"""
+Bitboard utilities
+Similar to Stockfish's bitboard.{h,cpp}
+
+A bitboard is a 64-bit Python int where bit N is set when square N
+(a1=0, h8=63) is occupied.
+"""
+
+from typing import Iterator
+
+
+FULL = 0xFFFFFFFFFFFFFFFF
+
+FILE_A = 0x0101010101010101
+FILE_H = FILE_A << 7
+
+RANK_1 = 0xFF
+RANK_8 = RANK_1 << 56
+
+SQUARE_BB = [1 << square for square in range(64)]
+
+FILE_BB = [FILE_A << file for file in range(8)]
+RANK_BB = [RANK_1 << (8 * rank) for rank in range(8)]
+
+# Files either side of a file
+ADJACENT_FILES_BB = [
+    (FILE_BB[file - 1] if file > 0 else 0) | (FILE_BB[file + 1] if file < 7 else 0)
+    for file in range(8)
+]
+
+
+def lsb(bb: int) -> int:
+    """Get index of least significant set bit"""
+    return (bb & -bb).bit_length() - 1
+
+
+def msb(bb: int) -> int:
+    """Get index of most significant set bit"""
+    return bb.bit_length() - 1
+
+
+def popcount(bb: int) -> int:
+    """Count set bits"""
+    return bb.bit_count()
+
+
+def iter_squares(bb: int) -> Iterator[int]:
+    """Iterate over set squares, one step per set bit"""
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def _leaper_attacks(offsets) -> list:
+    """Build a per-square attack table for (rank_step, file_step) offsets"""
+    table = []
+    for square in range(64):
+        attacks = 0
+        for dr, dc in offsets:
+            rank = (square >> 3) + dr
+            file = (square & 7) + dc
+            if 0 <= rank < 8 and 0 <= file < 8:
+                attacks |= SQUARE_BB[rank * 8 + file]
+        table.append(attacks)
+    return table
+
+
+# Attack tables, built once at import
+KNIGHT_ATTACKS = _leaper_attacks([
+    (-2, -1), (-2, 1), (-1, -2), (-1, 2),
+    (1, -2), (1, 2), (2, -1), (2, 1),
+])
+
+KING_ATTACKS = _leaper_attacks([
+    (-1, -1), (-1, 0), (-1, 1), (0, -1),
+    (0, 1), (1, -1), (1, 0), (1, 1),
+])
+
+# PAWN_ATTACKS[color][square]: squares a pawn of color on square attacks
+PAWN_ATTACKS = [
+    _leaper_attacks([(1, -1), (1, 1)]),
+    _leaper_attacks([(-1, -1), (-1, 1)]),
+]
+
+
+ROOK_DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+BISHOP_DIRECTIONS = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+
+def _ray_attacks(square: int, occupied: int, directions) -> int:
+    """Walk rays from square, stopping at (and including) the first blocker"""
+    attacks = 0
+    for dr, dc in directions:
+        rank = (square >> 3) + dr
+        file = (square & 7) + dc
+        while 0 <= rank < 8 and 0 <= file < 8:
+            bb = SQUARE_BB[rank * 8 + file]
+            attacks |= bb
+            if occupied & bb:
+                break
+            rank += dr
+            file += dc
+    return attacks
+
+
+def _relevant_mask(square: int, directions) -> int:
+    """Squares whose occupancy can change a slider's attacks (board edges excluded)"""
+    mask = 0
+    for dr, dc in directions:
+        rank = (square >> 3) + dr
+        file = (square & 7) + dc
+        while 0 <= rank + dr < 8 and 0 <= file + dc < 8:
+            mask |= SQUARE_BB[rank * 8 + file]
+            rank += dr
+            file += dc
+    return mask
+
+
+class _SliderTable(dict):
+    """
+    Attacks from one square keyed by relevant occupancy.
+    Plays the role of a magic-bitboard table: dict hashing of the masked
+    occupancy replaces the magic multiply. Entries are filled on first use
+    and then cached, so import stays cheap.
+    """
+
+    __slots__ = ("square", "directions")
+
+    def __init__(self, square: int, directions):
+        super().__init__()
+        self.square = square
+        self.directions = directions
+
+    def __missing__(self, occupied: int) -> int:
+        attacks = _ray_attacks(self.square, occupied, self.directions)
+        self[occupied] = attacks
+        return attacks
+
+
+ROOK_MASKS = [_relevant_mask(square, ROOK_DIRECTIONS) for square in range(64)]
+BISHOP_MASKS = [_relevant_mask(square, BISHOP_DIRECTIONS) for square in range(64)]
+
+# ROOK_TABLES[square][occupied & ROOK_MASKS[square]] -> attacks
+ROOK_TABLES = [_SliderTable(square, ROOK_DIRECTIONS) for square in range(64)]
+BISHOP_TABLES = [_SliderTable(square, BISHOP_DIRECTIONS) for square in range(64)]
+
+
+def rook_attacks(square: int, occupied: int) -> int:
+    """Get rook attacks from square given board occupancy"""
+    return ROOK_TABLES[square][occupied & ROOK_MASKS[square]]
+
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    """Get bishop attacks from square given board occupancy"""
+    return BISHOP_TABLES[square][occupied & BISHOP_MASKS[square]]
+
+
+def queen_attacks(square: int, occupied: int) -> int:
+    """Get queen attacks from square given board occupancy"""
+    return (
+        ROOK_TABLES[square][occupied & ROOK_MASKS[square]]
+        | BISHOP_TABLES[square][occupied & BISHOP_MASKS[square]]
+    )
+
+
+def _line_tables():
+    """Build BETWEEN_BB and LINE_BB for every pair of aligned squares"""
+    between = [[0] * 64 for _ in range(64)]
+    line = [[0] * 64 for _ in range(64)]
+    for square in range(64):
+        for dr, dc in ROOK_DIRECTIONS + BISHOP_DIRECTIONS:
+            full_line = _ray_attacks(square, 0, [(dr, dc), (-dr, -dc)]) | SQUARE_BB[square]
+            squares_between = 0
+            rank = (square >> 3) + dr
+            file = (square & 7) + dc
+            while 0 <= rank < 8 and 0 <= file < 8:
+                target = rank * 8 + file
+                between[square][target] = squares_between
+                line[square][target] = full_line
+                squares_between |= SQUARE_BB[target]
+                rank += dr
+                file += dc
+    return between, line
+
+
+# BETWEEN_BB[a][b]: squares strictly between two aligned squares, else 0
+# LINE_BB[a][b]: the whole line through two aligned squares, else 0
+BETWEEN_BB, LINE_BB = _line_tables()
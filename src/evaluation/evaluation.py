@@ -5,11 +5,54 @@ Similar to Stockfish's evaluation.{h,cpp}
 
 from typing import Dict
 
-from ..type_defs.chess_types import Color, PieceType, Piece, Square, PIECE_VALUES, PIECE_SQUARE_TABLES
+from ..type_defs.chess_types import Color, PieceType, Piece, PIECE_VALUES, PIECE_SQUARE_TABLES
 from ..position import Position
+from ..bitboard import (
+    FULL, SQUARE_BB, FILE_BB, RANK_BB, ADJACENT_FILES_BB, KNIGHT_ATTACKS, KING_ATTACKS,
+    bishop_attacks, rook_attacks, queen_attacks, iter_squares,
+)
 import config
 
 
+CENTER_KING_BB = (
+    (FILE_BB[3] | FILE_BB[4]) & (RANK_BB[2] | RANK_BB[3] | RANK_BB[4] | RANK_BB[5])
+)
+
+
+def _pawn_masks(color: Color, offsets) -> list:
+    """
+    Build a per-square mask of (rank_step, file_step) offsets, steps given
+    relative to color's direction of travel
+    """
+    direction = 1 if color == Color.WHITE else -1
+    masks = []
+    for square in range(64):
+        mask = 0
+        for dr, dc in offsets:
+            rank = (square >> 3) + dr * direction
+            file = (square & 7) + dc
+            if 0 <= rank < 8 and 0 <= file < 8:
+                mask |= SQUARE_BB[rank * 8 + file]
+        masks.append(mask)
+    return masks
+
+
+# Squares in front of a king that a shielding pawn may stand on
+KING_SHIELD_MASKS = [_pawn_masks(color, [(1, -1), (1, 0), (1, 1)]) for color in Color]
+
+# Squares ahead of a pawn on its own and adjacent files
+PASSED_PAWN_MASKS = [
+    _pawn_masks(color, [(dr, dc) for dr in range(1, 8) for dc in (-1, 0, 1)])
+    for color in Color
+]
+
+# Squares diagonally behind a pawn where a supporting pawn stands
+PAWN_SUPPORT_MASKS = [_pawn_masks(color, [(-1, -1), (-1, 1)]) for color in Color]
+
+# Squares from which an enemy pawn controls the square ahead of a pawn
+ADVANCE_CONTROL_MASKS = [_pawn_masks(color, [(2, -1), (2, 1)]) for color in Color]
+
+
 class Evaluator:
     """Evaluate chess positions"""
 
@@ -17,6 +60,7 @@ class Evaluator:
         self.material_weight = config.MATERIAL_WEIGHT
         self.position_weight = config.POSITION_WEIGHT
         self.mobility_weight = config.MOBILITY_WEIGHT
+        self.mobility_piece_weights = config.MOBILITY_PIECE_WEIGHTS
         self.king_safety_weight = config.KING_SAFETY_WEIGHT
         self.pawn_structure_weight = config.PAWN_STRUCTURE_WEIGHT
 
@@ -48,18 +92,12 @@ class Evaluator:
     def evaluate_material(self, position: Position) -> int:
         """Evaluate material balance"""
         score = 0
+        white = position.pieces[Color.WHITE]
+        black = position.pieces[Color.BLACK]
 
-        for square in Square:
-            piece = position.get_piece(square)
-            if piece is None:
-                continue
-
-            piece_value = PIECE_VALUES[piece.piece_type]
-
-            if piece.color == Color.WHITE:
-                score += piece_value
-            else:
-                score -= piece_value
+        for piece_type in PieceType:
+            count = white[piece_type].bit_count() - black[piece_type].bit_count()
+            score += PIECE_VALUES[piece_type] * count
 
         return score
 
@@ -67,76 +105,93 @@ class Evaluator:
         """Evaluate piece placement using piece-square tables"""
         score = 0
 
-        for square in Square:
-            piece = position.get_piece(square)
-            if piece is None:
-                continue
-
+        for piece_type in PieceType:
             # Get piece-square table
-            table = PIECE_SQUARE_TABLES.get(piece.piece_type, [0] * 64)
-
-            # Get value from table
-            if piece.color == Color.WHITE:
-                # White: use table as-is
-                value = table[square.value]
-                score += value
-            else:
-                # Black: mirror the table
-                mirrored_value = table[63 - square.value]
-                score -= mirrored_value
+            table = PIECE_SQUARE_TABLES.get(piece_type, [0] * 64)
 
-        return score
+            # White: use table as-is
+            for square in iter_squares(position.pieces[Color.WHITE][piece_type]):
+                score += table[square]
 
-    def evaluate_mobility(self, position: Position) -> int:
-        """Evaluate mobility (number of legal moves)"""
-        from ..movegen import MoveGenerator
+            # Black: mirror the table
+            for square in iter_squares(position.pieces[Color.BLACK][piece_type]):
+                score -= table[63 - square]
 
-        score = 0
-
-        # Save original turn
-        original_turn = position.turn
-
-        # White mobility
-        position.turn = Color.WHITE
-        movegen_white = MoveGenerator(position)
-        white_moves = len(movegen_white.generate_legal_moves())
-        score += white_moves
+        return score
 
-        # Black mobility
-        position.turn = Color.BLACK
-        movegen_black = MoveGenerator(position)
-        black_moves = len(movegen_black.generate_legal_moves())
-        score -= black_moves
+    def evaluate_mobility(self, position: Position) -> int:
+        """Evaluate mobility (attacked squares not held by own pieces)"""
+        weights = self.mobility_piece_weights
+        white = self.mobility_counts(position, Color.WHITE)
+        black = self.mobility_counts(position, Color.BLACK)
 
-        # Restore original turn
-        position.turn = original_turn
+        return sum(weight * (w - b) for weight, w, b in zip(weights, white, black))
 
-        return score
+    def mobility_counts(self, position: Position, color: Color) -> list:
+        """
+        Count pseudo-legal destination squares per piece type, straight from
+        the attack tables. Legality is not tested and the position is left
+        untouched.
+        """
+        counts = [0] * len(PieceType)
+        ours = position.pieces[color]
+        own = position.occupied[color]
+        enemy = position.occupied[color ^ 1]
+        occupied = position.occupied_all
+        targets = ~own
+
+        # Pawns: single pushes plus captures, set-wise
+        pawns = ours[PieceType.PAWN]
+        if color == Color.WHITE:
+            pushes = (pawns << 8) & ~occupied & FULL
+            captures = (((pawns & ~FILE_BB[0]) << 7) | ((pawns & ~FILE_BB[7]) << 9)) & enemy
+        else:
+            pushes = (pawns >> 8) & ~occupied
+            captures = (((pawns & ~FILE_BB[7]) >> 7) | ((pawns & ~FILE_BB[0]) >> 9)) & enemy
+        counts[PieceType.PAWN] = pushes.bit_count() + captures.bit_count()
+
+        count = 0
+        for square in iter_squares(ours[PieceType.KNIGHT]):
+            count += (KNIGHT_ATTACKS[square] & targets).bit_count()
+        counts[PieceType.KNIGHT] = count
+
+        count = 0
+        for square in iter_squares(ours[PieceType.BISHOP]):
+            count += (bishop_attacks(square, occupied) & targets).bit_count()
+        counts[PieceType.BISHOP] = count
+
+        count = 0
+        for square in iter_squares(ours[PieceType.ROOK]):
+            count += (rook_attacks(square, occupied) & targets).bit_count()
+        counts[PieceType.ROOK] = count
+
+        count = 0
+        for square in iter_squares(ours[PieceType.QUEEN]):
+            count += (queen_attacks(square, occupied) & targets).bit_count()
+        counts[PieceType.QUEEN] = count
+
+        king_square = position.king_squares[color]
+        if king_square is not None:
+            counts[PieceType.KING] = (KING_ATTACKS[king_square] & targets).bit_count()
+
+        return counts
 
     def evaluate_king_safety(self, position: Position) -> int:
         """Evaluate king safety"""
         score = 0
 
-        # Find kings
-        white_king_sq = None
-        black_king_sq = None
-
-        for square in Square:
-            piece = position.get_piece(square)
-            if piece and piece.piece_type == PieceType.KING:
-                if piece.color == Color.WHITE:
-                    white_king_sq = square
-                else:
-                    black_king_sq = square
+        # Kings are cached on the position
+        white_king_sq = position.king_square(Color.WHITE)
+        black_king_sq = position.king_square(Color.BLACK)
 
         # Evaluate white king safety
-        if white_king_sq:
+        if white_king_sq is not None:
             score += self.evaluate_single_king_safety(
                 position, white_king_sq, Color.WHITE
             )
 
         # Evaluate black king safety
-        if black_king_sq:
+        if black_king_sq is not None:
             score -= self.evaluate_single_king_safety(
                 position, black_king_sq, Color.BLACK
             )
@@ -144,23 +199,19 @@ class Evaluator:
         return score
 
     def evaluate_single_king_safety(
-        self, position: Position, king_sq: Square, color: Color
+        self, position: Position, king_sq: int, color: Color
     ) -> int:
         """Evaluate safety of a single king"""
         safety = 0
 
         # Penalty for king in center
-        center_squares = [
-            Square.D3, Square.D4, Square.D5, Square.D6,
-            Square.E3, Square.E4, Square.E5, Square.E6,
-        ]
-        if king_sq in center_squares:
+        if SQUARE_BB[king_sq] & CENTER_KING_BB:
             safety -= 30
 
         # Bonus for king on back rank
-        if color == Color.WHITE and king_sq.rank() == 0:
+        if color == Color.WHITE and king_sq >> 3 == 0:
             safety += 20
-        elif color == Color.BLACK and king_sq.rank() == 7:
+        elif color == Color.BLACK and king_sq >> 3 == 7:
             safety += 20
 
         # Penalty for exposed king
@@ -170,156 +221,74 @@ class Evaluator:
         return safety
 
     def is_king_exposed(
-        self, position: Position, king_sq: Square, color: Color
+        self, position: Position, king_sq: int, color: Color
     ) -> bool:
-        """Check if king is exposed (no pawn protection)"""
-        direction = 1 if color == Color.WHITE else -1
-
-        # Check squares in front of king
-        for dc in [-1, 0, 1]:
-            new_file = king_sq.file() + dc
-            if 0 <= new_file < 8:
-                pawn_sq = Square(
-                    king_sq.value + direction * 8 + dc
-                )
-                pawn = position.get_piece(pawn_sq)
-
-                if pawn and pawn.piece_type == PieceType.PAWN and pawn.color == color:
-                    return False
-
-        return True
+        """Check if king is exposed (no pawn on the three squares in front)"""
+        pawns = position.pieces[color][PieceType.PAWN]
+        return not KING_SHIELD_MASKS[color][king_sq] & pawns
 
     def evaluate_pawn_structure(self, position: Position) -> int:
         """Evaluate pawn structure"""
         score = 0
 
-        # Find pawns
-        white_pawns = []
-        black_pawns = []
-
-        for square in Square:
-            piece = position.get_piece(square)
-            if piece and piece.piece_type == PieceType.PAWN:
-                if piece.color == Color.WHITE:
-                    white_pawns.append(square)
-                else:
-                    black_pawns.append(square)
-
         # Evaluate white pawn structure
         score += self.evaluate_pawn_structure_color(
-            position, white_pawns, Color.WHITE
+            position, position.pieces[Color.WHITE][PieceType.PAWN], Color.WHITE
         )
 
         # Evaluate black pawn structure
         score -= self.evaluate_pawn_structure_color(
-            position, black_pawns, Color.BLACK
+            position, position.pieces[Color.BLACK][PieceType.PAWN], Color.BLACK
         )
 
         return score
 
     def evaluate_pawn_structure_color(
-        self, position: Position, pawns: list, color: Color
+        self, position: Position, pawns: int, color: Color
     ) -> int:
-        """Evaluate pawn structure for one color"""
+        """Evaluate pawn structure for one color, given its pawn bitboard"""
         structure_score = 0
 
         # Check for doubled pawns
-        file_counts = {}
-        for pawn in pawns:
-            file = pawn.file()
-            file_counts[file] = file_counts.get(file, 0) + 1
-
-        for count in file_counts.values():
+        for file_bb in FILE_BB:
+            count = (pawns & file_bb).bit_count()
             if count > 1:
                 structure_score -= 15 * (count - 1)
 
-        # Check for isolated pawns
-        for pawn in pawns:
-            file = pawn.file()
-            has_neighbor = False
-
-            # Check adjacent files
-            for adj_file in [file - 1, file + 1]:
-                if 0 <= adj_file < 8:
-                    for other_pawn in pawns:
-                        if other_pawn.file() == adj_file:
-                            has_neighbor = True
-                            break
-
-            if not has_neighbor:
+        for pawn in iter_squares(pawns):
+            # Check for isolated pawns
+            if not pawns & ADJACENT_FILES_BB[pawn & 7]:
                 structure_score -= 20
 
-        # Check for passed pawns
-        for pawn in pawns:
+            # Check for passed pawns
             if self.is_passed_pawn(position, pawn, color):
                 structure_score += 20
 
-        # Check for backward pawns
-        for pawn in pawns:
+            # Check for backward pawns
             if self.is_backward_pawn(position, pawn, color):
                 structure_score -= 10
 
         return structure_score
 
     def is_passed_pawn(
-        self, position: Position, pawn_sq: Square, color: Color
+        self, position: Position, pawn_sq: int, color: Color
     ) -> bool:
         """Check if pawn is passed"""
-        direction = 1 if color == Color.WHITE else -1
-
-        # Check all squares ahead
-        for rank in range(pawn_sq.rank() + direction, 8 if color == Color.WHITE else -1, direction):
-            for file in range(max(0, pawn_sq.file() - 1), min(8, pawn_sq.file() + 2)):
-                check_sq = Square(rank * 8 + file)
-                piece = position.get_piece(check_sq)
-
-                if piece and piece.piece_type == PieceType.PAWN and piece.color != color:
-                    return False
-
-        return True
+        enemy_pawns = position.pieces[color.opposite()][PieceType.PAWN]
+        return not PASSED_PAWN_MASKS[color][pawn_sq] & enemy_pawns
 
     def is_backward_pawn(
-        self, position: Position, pawn_sq: Square, color: Color
+        self, position: Position, pawn_sq: int, color: Color
     ) -> bool:
         """Check if pawn is backward"""
-        direction = 1 if color == Color.WHITE else -1
-
-        # Check if pawn has no pawn protection
-        has_support = False
-
-        for file in [pawn_sq.file() - 1, pawn_sq.file() + 1]:
-            if 0 <= file < 8:
-                support_sq = Square(
-                    pawn_sq.value - direction * 8 + (file - pawn_sq.file())
-                )
-                support_piece = position.get_piece(support_sq)
-
-                if (support_piece and
-                    support_piece.piece_type == PieceType.PAWN and
-                    support_piece.color == color):
-                    has_support = True
-                    break
+        # Check if pawn has pawn protection
+        if PAWN_SUPPORT_MASKS[color][pawn_sq] & position.pieces[color][PieceType.PAWN]:
+            return False
 
-        if has_support:
+        # Check if the advance square is empty but controlled by an opponent pawn
+        advance_sq = pawn_sq + (8 if color == Color.WHITE else -8)
+        if not 0 <= advance_sq < 64 or position.board[advance_sq] is not None:
             return False
 
-        # Check if pawn can advance safely
-        advance_sq = Square(pawn_sq.value + direction * 8)
-        if 0 <= advance_sq.value < 64:
-            advance_piece = position.get_piece(advance_sq)
-
-            if advance_piece is None:
-                # Check if controlled by opponent pawn
-                for file in [advance_sq.file() - 1, advance_sq.file() + 1]:
-                    if 0 <= file < 8:
-                        control_sq = Square(
-                            advance_sq.value - direction * 8 + (file - advance_sq.file())
-                        )
-                        control_piece = position.get_piece(control_sq)
-
-                        if (control_piece and
-                            control_piece.piece_type == PieceType.PAWN and
-                            control_piece.color != color):
-                            return True
-
-        return False
\ No newline at end of file
+        enemy_pawns = position.pieces[color.opposite()][PieceType.PAWN]
+        return bool(ADVANCE_CONTROL_MASKS[color][pawn_sq] & enemy_pawns)
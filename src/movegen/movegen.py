@@ -1,13 +1,38 @@
 """
 Move generation
 Similar to Stockfish's movegen.{h,cpp}
+
+Moves are packed 16-bit ints (see type_defs.encode_move) collected into
+array('H') buffers.
 """
 
-from typing import List, Set, Tuple
-import itertools
+from array import array
+from typing import Optional
 
-from ..type_defs.chess_types import Color, PieceType, Piece, Square, Move, MoveFlag
+from ..type_defs.chess_types import (
+    Color, PieceType, Piece, MoveFlag, PROMOTION_BIT,
+    KINGSIDE_CASTLING, QUEENSIDE_CASTLING,
+)
 from ..position import Position
+from ..bitboard import (
+    FULL, FILE_A, FILE_H, RANK_BB, SQUARE_BB, BETWEEN_BB, LINE_BB, KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS,
+    ROOK_MASKS, BISHOP_MASKS, ROOK_TABLES, BISHOP_TABLES,
+    rook_attacks, bishop_attacks, queen_attacks,
+)
+
+
+# Flag nibbles (bits 12-15) for promotions, queen first
+PROMOTION_FLAGS = [
+    (PROMOTION_BIT | (PieceType.QUEEN - 1)) << 12,
+    (PROMOTION_BIT | (PieceType.ROOK - 1)) << 12,
+    (PROMOTION_BIT | (PieceType.BISHOP - 1)) << 12,
+    (PROMOTION_BIT | (PieceType.KNIGHT - 1)) << 12,
+]
+
+DOUBLE_PAWN = MoveFlag.DOUBLE_PAWN << 12
+EN_PASSANT = MoveFlag.EN_PASSANT << 12
+CASTLE_KING = MoveFlag.CASTLE_KING << 12
+CASTLE_QUEEN = MoveFlag.CASTLE_QUEEN << 12
 
 
 class MoveGenerator:
@@ -16,378 +41,600 @@ class MoveGenerator:
     def __init__(self, position: Position):
         self.position = position
 
-    def generate_legal_moves(self) -> List[Move]:
-        """Generate all legal moves for current position"""
-        moves = self.generate_pseudo_legal_moves()
-        legal_moves = []
-
-        for move in moves:
-            # Make move on copy of position
-            new_pos = self.position.copy()
-            new_pos.make_move(move)
-
-            # Check if move leaves king in check
-            if not self.is_in_check(new_pos, self.position.turn):
-                legal_moves.append(move)
-
-        return legal_moves
-
-    def generate_pseudo_legal_moves(self) -> List[Move]:
-        """Generate pseudo-legal moves (may leave king in check)"""
-        moves = []
-        turn = self.position.turn
-
-        # Generate moves for each piece
-        for square in Square:
-            piece = self.position.get_piece(square)
-            if piece is None or piece.color != turn:
-                continue
-
-            piece_moves = self.generate_piece_moves(square, piece)
-            moves.extend(piece_moves)
-
+    def generate_legal_moves(self) -> array:
+        """
+        Generate all legal moves for current position.
+        Checkers and pinned pieces are computed once, so every move emitted
+        is legal without making it.
+        """
+        moves = array('H')
+        self._generate_legal(moves, True, True)
         return moves
 
-    def generate_piece_moves(self, square: Square, piece: Piece) -> List[Move]:
-        """Generate moves for a specific piece"""
-        moves = []
-
-        if piece.piece_type == PieceType.PAWN:
-            moves.extend(self.generate_pawn_moves(square, piece))
-        elif piece.piece_type == PieceType.KNIGHT:
-            moves.extend(self.generate_knight_moves(square, piece))
-        elif piece.piece_type == PieceType.BISHOP:
-            moves.extend(self.generate_bishop_moves(square, piece))
-        elif piece.piece_type == PieceType.ROOK:
-            moves.extend(self.generate_rook_moves(square, piece))
-        elif piece.piece_type == PieceType.QUEEN:
-            moves.extend(self.generate_queen_moves(square, piece))
-        elif piece.piece_type == PieceType.KING:
-            moves.extend(self.generate_king_moves(square, piece))
-
+    def generate_legal_captures(self) -> array:
+        """Generate legal captures and queen promotions"""
+        moves = array('H')
+        self._generate_legal(moves, True, False)
         return moves
 
-    def generate_pawn_moves(self, square: Square, piece: Piece) -> List[Move]:
-        """Generate pawn moves"""
-        moves = []
-        direction = 1 if piece.color == Color.WHITE else -1
+    def generate_legal_quiets(self) -> array:
+        """Generate legal non-captures other than queen promotions"""
+        moves = array('H')
+        self._generate_legal(moves, False, True)
+        return moves
 
-        # Single push
-        forward_sq = Square(square.value + direction * 8)
-        if 0 <= forward_sq.value < 64:
-            if self.position.get_piece(forward_sq) is None:
-                # Check for promotion
-                rank = forward_sq.rank()
-                if rank == 0 or rank == 7:
-                    promotions = [
-                        PieceType.QUEEN,
-                        PieceType.ROOK,
-                        PieceType.BISHOP,
-                        PieceType.KNIGHT,
-                    ]
-                    for promo in promotions:
-                        moves.append(Move(square, forward_sq, MoveFlag.PROMOTION, promo))
+    def generate_noisy_moves(self) -> array:
+        """
+        Generate pseudo-legal captures and queen promotions for quiescence.
+        Only squares holding enemy pieces are targeted; legality is left to
+        is_legal so it is paid only for moves actually searched. When in
+        check, use generate_legal_moves for the evasions instead.
+        """
+        position = self.position
+        us = position.turn
+        ours = position.pieces[us]
+        enemy = position.occupied[us ^ 1]
+        occupied = position.occupied_all
+        moves = array('H')
+
+        # Pawn captures, set-wise: to = from + shift
+        pawns = ours[PieceType.PAWN]
+        if us == Color.WHITE:
+            captures = [((pawns & ~FILE_A) << 7 & enemy, 7), ((pawns & ~FILE_H) << 9 & enemy, 9)]
+            push_promotions = (pawns & RANK_BB[6]) << 8 & ~occupied
+            push = 8
+            last_rank = RANK_BB[7]
+        else:
+            captures = [((pawns & ~FILE_H) >> 7 & enemy, -7), ((pawns & ~FILE_A) >> 9 & enemy, -9)]
+            push_promotions = (pawns & RANK_BB[1]) >> 8 & ~occupied
+            push = -8
+            last_rank = RANK_BB[0]
+
+        for targets, shift in captures:
+            while targets:
+                low = targets & -targets
+                targets ^= low
+                to_sq = low.bit_length() - 1
+                from_sq = to_sq - shift
+                if low & last_rank:
+                    for promo in PROMOTION_FLAGS:
+                        moves.append(from_sq | to_sq << 6 | promo)
                 else:
-                    moves.append(Move(square, forward_sq))
-
-                    # Double push (check if pawn is on starting rank)
-                    current_rank = square.rank()
-                    start_rank = 1 if piece.color == Color.WHITE else 6
-                    if current_rank == start_rank:
-                        double_sq = Square(forward_sq.value + direction * 8)
-                        if self.position.get_piece(double_sq) is None:
-                            moves.append(Move(square, double_sq, MoveFlag.DOUBLE_PAWN))
-
-        # Captures
-        capture_files = [square.file() - 1, square.file() + 1]
-        for file in capture_files:
-            if 0 <= file < 8:
-                capture_sq = Square(square.value + direction * 8 + (file - square.file()))
-                if 0 <= capture_sq.value < 64:
-                    capture_piece = self.position.get_piece(capture_sq)
-                    if capture_piece and capture_piece.color != piece.color:
-                        rank = capture_sq.rank()
-                        if rank == 0 or rank == 7:
-                            promotions = [
-                                PieceType.QUEEN,
-                                PieceType.ROOK,
-                                PieceType.BISHOP,
-                                PieceType.KNIGHT,
-                            ]
-                            for promo in promotions:
-                                moves.append(Move(square, capture_sq, MoveFlag.PROMOTION, promo))
-                        else:
-                            moves.append(Move(square, capture_sq))
-
-                    # En passant
-                    if self.position.en_passant == capture_sq:
-                        moves.append(Move(square, capture_sq, MoveFlag.EN_PASSANT))
+                    moves.append(from_sq | to_sq << 6)
+
+        while push_promotions:
+            low = push_promotions & -push_promotions
+            push_promotions ^= low
+            to_sq = low.bit_length() - 1
+            moves.append((to_sq - push) | to_sq << 6 | PROMOTION_FLAGS[0])
+
+        ep_sq = position.en_passant
+        if ep_sq is not None:
+            ep_pawns = PAWN_ATTACKS[us ^ 1][ep_sq] & pawns
+            captured = position.board[ep_sq - push]
+            if captured is not None and captured.color != us and captured.piece_type == PieceType.PAWN:
+                while ep_pawns:
+                    low = ep_pawns & -ep_pawns
+                    ep_pawns ^= low
+                    moves.append((low.bit_length() - 1) | ep_sq << 6 | EN_PASSANT)
+
+        # Pieces
+        knights = ours[PieceType.KNIGHT]
+        while knights:
+            low = knights & -knights
+            knights ^= low
+            from_sq = low.bit_length() - 1
+            self._append_moves(from_sq, KNIGHT_ATTACKS[from_sq] & enemy, moves)
+
+        bishops = ours[PieceType.BISHOP] | ours[PieceType.QUEEN]
+        while bishops:
+            low = bishops & -bishops
+            bishops ^= low
+            from_sq = low.bit_length() - 1
+            attacks = BISHOP_TABLES[from_sq][occupied & BISHOP_MASKS[from_sq]]
+            self._append_moves(from_sq, attacks & enemy, moves)
+
+        rooks = ours[PieceType.ROOK] | ours[PieceType.QUEEN]
+        while rooks:
+            low = rooks & -rooks
+            rooks ^= low
+            from_sq = low.bit_length() - 1
+            attacks = ROOK_TABLES[from_sq][occupied & ROOK_MASKS[from_sq]]
+            self._append_moves(from_sq, attacks & enemy, moves)
+
+        king_sq = position.king_squares[us]
+        if king_sq is not None:
+            self._append_moves(king_sq, KING_ATTACKS[king_sq] & enemy, moves)
 
         return moves
 
-    def generate_knight_moves(self, square: Square, piece: Piece) -> List[Move]:
-        """Generate knight moves"""
-        moves = []
-        knight_offsets = [
-            (-2, -1), (-2, 1), (-1, -2), (-1, 2),
-            (1, -2), (1, 2), (2, -1), (2, 1),
-        ]
+    def checkers(self) -> int:
+        """Get bitboard of enemy pieces giving check to the side to move"""
+        position = self.position
+        us = position.turn
+        king_sq = position.king_squares[us]
+        if king_sq is None:
+            return 0
+        return position.attackers_to(king_sq) & position.occupied[us ^ 1]
 
-        for dr, dc in knight_offsets:
-            new_rank = square.rank() + dr
-            new_file = square.file() + dc
+    def pinned_pieces(self, color: Color) -> int:
+        """Get bitboard of color's pieces pinned to its own king"""
+        position = self.position
+        king_sq = position.king_squares[color]
+        if king_sq is None:
+            return 0
+
+        theirs = position.pieces[color ^ 1]
+        snipers = (
+            (rook_attacks(king_sq, 0) & (theirs[PieceType.ROOK] | theirs[PieceType.QUEEN]))
+            | (bishop_attacks(king_sq, 0) & (theirs[PieceType.BISHOP] | theirs[PieceType.QUEEN]))
+        )
+
+        occupied = position.occupied_all
+        between = BETWEEN_BB[king_sq]
+        pinned = 0
+        while snipers:
+            low = snipers & -snipers
+            snipers ^= low
+            blockers = between[low.bit_length() - 1] & occupied
+            # Exactly one piece between king and sniper
+            if blockers and not blockers & (blockers - 1):
+                pinned |= blockers
+
+        return pinned & position.occupied[color]
+
+    def is_pseudo_legal(self, move: int) -> bool:
+        """
+        Check that a packed move, e.g. from a table or another position,
+        could be played by the side to move ignoring pins and checks.
+        Castling moves are fully checked.
+        """
+        position = self.position
+        board = position.board
+        us = position.turn
+        from_sq = move & 0x3F
+        to_sq = (move >> 6) & 0x3F
+        flag = move >> 12
+        piece = board[from_sq]
+
+        if move == 0 or piece is None or piece.color != us:
+            return False
+        target = board[to_sq]
+        if target is not None and target.color == us:
+            return False
 
-            if 0 <= new_rank < 8 and 0 <= new_file < 8:
-                target_sq = Square(new_rank * 8 + new_file)
-                target_piece = self.position.get_piece(target_sq)
+        if flag == MoveFlag.CASTLE_KING:
+            return from_sq == (0 if us == Color.WHITE else 56) + 4 and \
+                to_sq == from_sq + 2 and self.can_castle_king(us)
+        if flag == MoveFlag.CASTLE_QUEEN:
+            return from_sq == (0 if us == Color.WHITE else 56) + 4 and \
+                to_sq == from_sq - 2 and self.can_castle_queen(us)
 
-                if target_piece is None or target_piece.color != piece.color:
-                    moves.append(Move(square, target_sq))
+        if piece.piece_type == PieceType.PAWN:
+            direction = 8 if us == Color.WHITE else -8
+            last_rank = (to_sq >> 3) == (7 if us == Color.WHITE else 0)
+            if flag == MoveFlag.EN_PASSANT:
+                return to_sq == position.en_passant and \
+                    bool(PAWN_ATTACKS[us][from_sq] & SQUARE_BB[to_sq])
+            if flag == MoveFlag.DOUBLE_PAWN:
+                return (from_sq >> 3) == (1 if us == Color.WHITE else 6) and \
+                    to_sq == from_sq + 2 * direction and target is None and \
+                    board[from_sq + direction] is None
+            if bool(flag & PROMOTION_BIT) != last_rank or flag not in (0, PROMOTION_BIT,
+                                                                       PROMOTION_BIT | 1,
+                                                                       PROMOTION_BIT | 2,
+                                                                       PROMOTION_BIT | 3):
+                return False
+            if target is None:
+                return to_sq == from_sq + direction
+            return bool(PAWN_ATTACKS[us][from_sq] & SQUARE_BB[to_sq])
+
+        if flag != MoveFlag.NORMAL:
+            return False
 
-        return moves
+        piece_type = piece.piece_type
+        if piece_type == PieceType.KNIGHT:
+            attacks = KNIGHT_ATTACKS[from_sq]
+        elif piece_type == PieceType.KING:
+            attacks = KING_ATTACKS[from_sq]
+        elif piece_type == PieceType.BISHOP:
+            attacks = bishop_attacks(from_sq, position.occupied_all)
+        elif piece_type == PieceType.ROOK:
+            attacks = rook_attacks(from_sq, position.occupied_all)
+        else:
+            attacks = queen_attacks(from_sq, position.occupied_all)
+        return bool(attacks & SQUARE_BB[to_sq])
+
+    def is_legal(
+        self, move: int, checkers: Optional[int] = None, pinned: Optional[int] = None
+    ) -> bool:
+        """
+        Check that a pseudo-legal move does not leave our king in check.
+        checkers and pinned may be passed in when testing several moves.
+        """
+        position = self.position
+        us = position.turn
+        them = us ^ 1
+        from_sq = move & 0x3F
+        to_sq = (move >> 6) & 0x3F
+        flag = move >> 12
+        king_sq = position.king_squares[us]
 
-    def generate_bishop_moves(self, square: Square, piece: Piece) -> List[Move]:
-        """Generate bishop moves"""
-        moves = []
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+        if king_sq is None:
+            return False
 
-        for dr, dc in directions:
-            for i in range(1, 8):
-                new_rank = square.rank() + dr * i
-                new_file = square.file() + dc * i
+        # Castling was fully checked by is_pseudo_legal
+        if flag == MoveFlag.CASTLE_KING or flag == MoveFlag.CASTLE_QUEEN:
+            return True
 
-                if not (0 <= new_rank < 8 and 0 <= new_file < 8):
-                    break
+        if from_sq == king_sq:
+            return not position.is_square_attacked(
+                to_sq, them, position.occupied_all ^ SQUARE_BB[king_sq]
+            )
+
+        if flag == MoveFlag.EN_PASSANT:
+            captured_bb = SQUARE_BB[(from_sq & ~7) | (to_sq & 7)]
+            occupied_after = (position.occupied_all ^ SQUARE_BB[from_sq] ^ captured_bb) \
+                | SQUARE_BB[to_sq]
+            return not position.attackers_to(king_sq, occupied_after) \
+                & position.occupied[them] & ~captured_bb
+
+        if checkers is None:
+            checkers = self.checkers()
+        if checkers:
+            # Double check, or a move that neither captures nor blocks the checker
+            if checkers & (checkers - 1):
+                return False
+            check_mask = checkers | BETWEEN_BB[king_sq][checkers.bit_length() - 1]
+            if not check_mask & SQUARE_BB[to_sq]:
+                return False
+
+        if pinned is None:
+            pinned = self.pinned_pieces(us)
+        return not pinned & SQUARE_BB[from_sq] or bool(LINE_BB[king_sq][from_sq] & SQUARE_BB[to_sq])
+
+    def _generate_legal(self, moves: array, captures: bool, quiets: bool) -> None:
+        """
+        Append legal moves to moves. captures selects captures and queen
+        promotions; quiets selects the rest.
+        """
+        position = self.position
+        us = position.turn
+        them = us ^ 1
+        ours = position.pieces[us]
+        enemy = position.occupied[them]
+        occupied = position.occupied_all
+        king_sq = position.king_squares[us]
 
-                target_sq = Square(new_rank * 8 + new_file)
-                target_piece = self.position.get_piece(target_sq)
+        if king_sq is None:
+            return
+
+        targets = 0
+        if captures:
+            targets |= enemy
+        if quiets:
+            targets |= ~occupied & FULL
+
+        # King moves: the target must not be attacked once the king has left
+        occupied_without_king = occupied ^ SQUARE_BB[king_sq]
+        king_targets = KING_ATTACKS[king_sq] & targets
+        while king_targets:
+            low = king_targets & -king_targets
+            king_targets ^= low
+            to_sq = low.bit_length() - 1
+            if not position.is_square_attacked(to_sq, them, occupied_without_king):
+                moves.append(king_sq | to_sq << 6)
+
+        checkers = position.attackers_to(king_sq) & enemy
+
+        # Double check: only the king can move
+        if checkers & (checkers - 1):
+            return
+
+        # In check, other pieces must capture the checker or block
+        check_mask = FULL
+        if checkers:
+            check_mask = checkers | BETWEEN_BB[king_sq][checkers.bit_length() - 1]
+        elif quiets:
+            if self.can_castle_king(us):
+                moves.append(king_sq | (king_sq + 2) << 6 | CASTLE_KING)
+            if self.can_castle_queen(us):
+                moves.append(king_sq | (king_sq - 2) << 6 | CASTLE_QUEEN)
+
+        pinned = self.pinned_pieces(us)
+        line = LINE_BB[king_sq]
+        targets &= check_mask
+
+        # Pawns
+        self._generate_legal_pawn_moves(
+            moves, ours[PieceType.PAWN], check_mask, pinned, captures, quiets
+        )
+
+        # Pinned knights can never move
+        knights = ours[PieceType.KNIGHT] & ~pinned
+        while knights:
+            low = knights & -knights
+            knights ^= low
+            from_sq = low.bit_length() - 1
+            self._append_moves(from_sq, KNIGHT_ATTACKS[from_sq] & targets, moves)
+
+        # Sliders: a pinned slider may only move along the pin line
+        bishops = ours[PieceType.BISHOP] | ours[PieceType.QUEEN]
+        while bishops:
+            low = bishops & -bishops
+            bishops ^= low
+            from_sq = low.bit_length() - 1
+            attacks = BISHOP_TABLES[from_sq][occupied & BISHOP_MASKS[from_sq]] & targets
+            if pinned & low:
+                attacks &= line[from_sq]
+            self._append_moves(from_sq, attacks, moves)
+
+        rooks = ours[PieceType.ROOK] | ours[PieceType.QUEEN]
+        while rooks:
+            low = rooks & -rooks
+            rooks ^= low
+            from_sq = low.bit_length() - 1
+            attacks = ROOK_TABLES[from_sq][occupied & ROOK_MASKS[from_sq]] & targets
+            if pinned & low:
+                attacks &= line[from_sq]
+            self._append_moves(from_sq, attacks, moves)
+
+    def _generate_legal_pawn_moves(
+        self,
+        moves: array,
+        pawns: int,
+        check_mask: int,
+        pinned: int,
+        captures: bool,
+        quiets: bool
+    ) -> None:
+        """Append legal pawn moves, including promotions and en passant"""
+        position = self.position
+        board = position.board
+        us = position.turn
+        enemy = position.occupied[us ^ 1]
+        king_sq = position.king_squares[us]
+        line = LINE_BB[king_sq]
+        attack_table = PAWN_ATTACKS[us]
+        direction = 8 if us == Color.WHITE else -8
+        start_rank = 1 if us == Color.WHITE else 6
+        ep_sq = position.en_passant
+
+        while pawns:
+            low = pawns & -pawns
+            pawns ^= low
+            from_sq = low.bit_length() - 1
+
+            allowed = check_mask
+            if pinned & low:
+                allowed &= line[from_sq]
+
+            # Pushes
+            to_sq = from_sq + direction
+            if board[to_sq] is None:
+                if SQUARE_BB[to_sq] & allowed:
+                    rank = to_sq >> 3
+                    if rank == 0 or rank == 7:
+                        if captures:
+                            moves.append(from_sq | to_sq << 6 | PROMOTION_FLAGS[0])
+                        if quiets:
+                            for promo in PROMOTION_FLAGS[1:]:
+                                moves.append(from_sq | to_sq << 6 | promo)
+                    elif quiets:
+                        moves.append(from_sq | to_sq << 6)
+
+                if quiets and from_sq >> 3 == start_rank:
+                    double_sq = to_sq + direction
+                    if board[double_sq] is None and SQUARE_BB[double_sq] & allowed:
+                        moves.append(from_sq | double_sq << 6 | DOUBLE_PAWN)
+
+            if not captures:
+                continue
 
-                if target_piece is None:
-                    moves.append(Move(square, target_sq))
+            # Captures
+            attacks = attack_table[from_sq]
+            targets = attacks & enemy & allowed
+            while targets:
+                target = targets & -targets
+                targets ^= target
+                to_sq = target.bit_length() - 1
+                rank = to_sq >> 3
+                if rank == 0 or rank == 7:
+                    for promo in PROMOTION_FLAGS:
+                        moves.append(from_sq | to_sq << 6 | promo)
                 else:
-                    if target_piece.color != piece.color:
-                        moves.append(Move(square, target_sq))
-                    break
+                    moves.append(from_sq | to_sq << 6)
+
+            # En passant can uncover a check along the rank, so test the
+            # king against the board as it will be after the capture
+            if ep_sq is not None and attacks & SQUARE_BB[ep_sq]:
+                captured_sq = (from_sq & ~7) | (ep_sq & 7)
+                passed = board[captured_sq]
+                if passed is None or passed.color == us or passed.piece_type != PieceType.PAWN:
+                    continue
+                captured_bb = SQUARE_BB[captured_sq]
+                occupied_after = (position.occupied_all ^ low ^ captured_bb) | SQUARE_BB[ep_sq]
+                if not position.attackers_to(king_sq, occupied_after) & enemy & ~captured_bb:
+                    moves.append(from_sq | ep_sq << 6 | EN_PASSANT)
 
-        return moves
+    def generate_pseudo_legal_moves(self) -> array:
+        """Generate pseudo-legal moves (may leave king in check)"""
+        moves = array('H')
 
-    def generate_rook_moves(self, square: Square, piece: Piece) -> List[Move]:
-        """Generate rook moves"""
-        moves = []
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+        # Generate moves for each of our pieces, one step per occupied square
+        for square, piece in self.position.iter_pieces(self.position.turn):
+            self.generate_piece_moves(square, piece, moves)
 
-        for dr, dc in directions:
-            for i in range(1, 8):
-                new_rank = square.rank() + dr * i
-                new_file = square.file() + dc * i
+        return moves
 
-                if not (0 <= new_rank < 8 and 0 <= new_file < 8):
-                    break
+    def generate_piece_moves(self, square: int, piece: Piece, moves: array) -> None:
+        """Append moves for a specific piece to moves"""
+        if piece.piece_type == PieceType.PAWN:
+            self.generate_pawn_moves(square, piece, moves)
+        elif piece.piece_type == PieceType.KNIGHT:
+            self.generate_knight_moves(square, piece, moves)
+        elif piece.piece_type == PieceType.BISHOP:
+            self.generate_bishop_moves(square, piece, moves)
+        elif piece.piece_type == PieceType.ROOK:
+            self.generate_rook_moves(square, piece, moves)
+        elif piece.piece_type == PieceType.QUEEN:
+            self.generate_queen_moves(square, piece, moves)
+        elif piece.piece_type == PieceType.KING:
+            self.generate_king_moves(square, piece, moves)
 
-                target_sq = Square(new_rank * 8 + new_file)
-                target_piece = self.position.get_piece(target_sq)
+    def generate_pawn_moves(self, square: int, piece: Piece, moves: array) -> None:
+        """Generate pawn moves"""
+        position = self.position
+        board = position.board
+        color = piece.color
+        direction = 8 if color == Color.WHITE else -8
 
-                if target_piece is None:
-                    moves.append(Move(square, target_sq))
-                else:
-                    if target_piece.color != piece.color:
-                        moves.append(Move(square, target_sq))
-                    break
+        # Single push
+        forward_sq = square + direction
+        if board[forward_sq] is None:
+            # Check for promotion
+            rank = forward_sq >> 3
+            if rank == 0 or rank == 7:
+                for promo in PROMOTION_FLAGS:
+                    moves.append(square | forward_sq << 6 | promo)
+            else:
+                moves.append(square | forward_sq << 6)
+
+                # Double push (check if pawn is on starting rank)
+                start_rank = 1 if color == Color.WHITE else 6
+                if square >> 3 == start_rank:
+                    double_sq = forward_sq + direction
+                    if board[double_sq] is None:
+                        moves.append(square | double_sq << 6 | DOUBLE_PAWN)
 
-        return moves
+        # Captures
+        attacks = PAWN_ATTACKS[color][square]
+        targets = attacks & position.occupied[color ^ 1]
+        while targets:
+            low = targets & -targets
+            capture_sq = low.bit_length() - 1
+            targets ^= low
+            rank = capture_sq >> 3
+            if rank == 0 or rank == 7:
+                for promo in PROMOTION_FLAGS:
+                    moves.append(square | capture_sq << 6 | promo)
+            else:
+                moves.append(square | capture_sq << 6)
+
+        # En passant (the passed pawn sits beside us)
+        ep_sq = position.en_passant
+        if ep_sq is not None and attacks & SQUARE_BB[ep_sq]:
+            passed = board[(square & ~7) | (ep_sq & 7)]
+            if passed and passed.color != color:
+                moves.append(square | ep_sq << 6 | EN_PASSANT)
+
+    def generate_knight_moves(self, square: int, piece: Piece, moves: array) -> None:
+        """Generate knight moves"""
+        self._append_moves(square, KNIGHT_ATTACKS[square] & ~self.position.occupied[piece.color], moves)
 
-    def generate_queen_moves(self, square: Square, piece: Piece) -> List[Move]:
-        """Generate queen moves"""
-        moves = []
+    def _append_moves(self, square: int, targets: int, moves: array) -> None:
+        """Append a normal move from square to each target in a bitboard"""
+        while targets:
+            low = targets & -targets
+            moves.append(square | (low.bit_length() - 1) << 6)
+            targets ^= low
 
-        # Bishop moves
-        moves.extend(self.generate_bishop_moves(square, piece))
+    def generate_bishop_moves(self, square: int, piece: Piece, moves: array) -> None:
+        """Generate bishop moves"""
+        position = self.position
+        attacks = BISHOP_TABLES[square][position.occupied_all & BISHOP_MASKS[square]]
+        self._append_moves(square, attacks & ~position.occupied[piece.color], moves)
 
-        # Rook moves
-        moves.extend(self.generate_rook_moves(square, piece))
+    def generate_rook_moves(self, square: int, piece: Piece, moves: array) -> None:
+        """Generate rook moves"""
+        position = self.position
+        attacks = ROOK_TABLES[square][position.occupied_all & ROOK_MASKS[square]]
+        self._append_moves(square, attacks & ~position.occupied[piece.color], moves)
 
-        return moves
+    def generate_queen_moves(self, square: int, piece: Piece, moves: array) -> None:
+        """Generate queen moves"""
+        position = self.position
+        attacks = queen_attacks(square, position.occupied_all)
+        self._append_moves(square, attacks & ~position.occupied[piece.color], moves)
 
-    def generate_king_moves(self, square: Square, piece: Piece) -> List[Move]:
+    def generate_king_moves(self, square: int, piece: Piece, moves: array) -> None:
         """Generate king moves"""
-        moves = []
-
         # Normal moves
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
-
-                new_rank = square.rank() + dr
-                new_file = square.file() + dc
-
-                if 0 <= new_rank < 8 and 0 <= new_file < 8:
-                    target_sq = Square(new_rank * 8 + new_file)
-                    target_piece = self.position.get_piece(target_sq)
-
-                    if target_piece is None or target_piece.color != piece.color:
-                        moves.append(Move(square, target_sq))
+        self._append_moves(square, KING_ATTACKS[square] & ~self.position.occupied[piece.color], moves)
 
         # Castling
         if self.can_castle_king(piece.color):
-            moves.append(Move(square, Square(square.value + 2), MoveFlag.CASTLE_KING))
+            moves.append(square | (square + 2) << 6 | CASTLE_KING)
 
         if self.can_castle_queen(piece.color):
-            moves.append(Move(square, Square(square.value - 2), MoveFlag.CASTLE_QUEEN))
-
-        return moves
+            moves.append(square | (square - 2) << 6 | CASTLE_QUEEN)
 
     def can_castle_king(self, color: Color) -> bool:
-        """Check if kingside castling is possible"""
-        if not self.position.castling[color]["king"]:
-            return False
-
-        if self.is_in_check(self.position, color):
-            return False
-
-        # Check squares between king and rook
-        rank = 0 if color == Color.WHITE else 7
-        king_sq = Square(rank * 8 + 4)
-
-        if self.position.get_piece(Square(rank * 8 + 5)) is not None:
-            return False
-
-        if self.position.get_piece(Square(rank * 8 + 6)) is not None:
-            return False
-
-        # Check if passing through check
-        pass_sq = Square(rank * 8 + 5)
-        new_pos = self.position.copy()
-        new_pos.set_piece(king_sq, None)
-        new_pos.set_piece(pass_sq, Piece(color, PieceType.KING))
-
-        if self.is_in_check(new_pos, color):
-            return False
-
-        return True
+        """Check if kingside castling is legal"""
+        return self._can_castle(color, KINGSIDE_CASTLING[color], 7, [5, 6], [5, 6])
 
     def can_castle_queen(self, color: Color) -> bool:
-        """Check if queenside castling is possible"""
-        if not self.position.castling[color]["queen"]:
+        """Check if queenside castling is legal"""
+        return self._can_castle(color, QUEENSIDE_CASTLING[color], 0, [1, 2, 3], [3, 2])
+
+    def _can_castle(
+        self, color: Color, right: int, rook_file: int, empty_files: list, king_path: list
+    ) -> bool:
+        """
+        Check castling rights, that the squares between king and rook are
+        empty, and that the king is not in, passing through or landing in check
+        """
+        position = self.position
+        if not position.castling & right:
             return False
 
-        if self.is_in_check(self.position, color):
+        rank_base = 0 if color == Color.WHITE else 56
+        board = position.board
+        king = board[rank_base + 4]
+        rook = board[rank_base + rook_file]
+        if (king is None or king.piece_type != PieceType.KING or king.color != color
+                or rook is None or rook.piece_type != PieceType.ROOK or rook.color != color):
             return False
 
-        # Check squares between king and rook
-        rank = 0 if color == Color.WHITE else 7
-        king_sq = Square(rank * 8 + 4)
+        for file in empty_files:
+            if board[rank_base + file] is not None:
+                return False
 
-        if self.position.get_piece(Square(rank * 8 + 3)) is not None:
-            return False
-
-        if self.position.get_piece(Square(rank * 8 + 2)) is not None:
-            return False
-
-        if self.position.get_piece(Square(rank * 8 + 1)) is not None:
-            return False
-
-        # Check if passing through check
-        pass_sq = Square(rank * 8 + 3)
-        new_pos = self.position.copy()
-        new_pos.set_piece(king_sq, None)
-        new_pos.set_piece(pass_sq, Piece(color, PieceType.KING))
-
-        if self.is_in_check(new_pos, color):
-            return False
+        them = color ^ 1
+        for file in [4] + king_path:
+            if position.is_square_attacked(rank_base + file, them):
+                return False
 
         return True
 
     def is_in_check(self, position: Position, color: Color) -> bool:
         """Check if color is in check"""
-        # Find king
-        king_sq = None
-        for square in Square:
-            piece = position.get_piece(square)
-            if piece and piece.piece_type == PieceType.KING and piece.color == color:
-                king_sq = square
-                break
+        king_sq = position.king_squares[color]
 
         if king_sq is None:
             return True
 
-        # Check if any opponent piece attacks the king
-        opponent = color.opposite()
-        for square in Square:
-            piece = position.get_piece(square)
-            if piece and piece.color == opponent:
-                if self.square_attacked_by(square, king_sq, position):
-                    return True
-
-        return False
+        return position.is_square_attacked(king_sq, color.opposite())
 
-    def square_attacked_by(self, attacker_sq: Square, target_sq: Square, position: Position) -> bool:
+    def square_attacked_by(self, attacker_sq: int, target_sq: int, position: Position) -> bool:
         """Check if attacker_sq attacks target_sq"""
         attacker = position.get_piece(attacker_sq)
         if attacker is None:
             return False
 
-        # Generate pseudo-legal moves for attacker
-        temp_gen = MoveGenerator(position)
+        target_bb = SQUARE_BB[target_sq]
 
         if attacker.piece_type == PieceType.PAWN:
-            direction = 1 if attacker.color == Color.WHITE else -1
-            capture_files = [attacker_sq.file() - 1, attacker_sq.file() + 1]
-            for file in capture_files:
-                if 0 <= file < 8:
-                    capture_sq = Square(
-                        attacker_sq.value + direction * 8 + (file - attacker_sq.file())
-                    )
-                    if capture_sq == target_sq:
-                        return True
+            return bool(PAWN_ATTACKS[attacker.color][attacker_sq] & target_bb)
         elif attacker.piece_type == PieceType.KNIGHT:
-            knight_offsets = [
-                (-2, -1), (-2, 1), (-1, -2), (-1, 2),
-                (1, -2), (1, 2), (2, -1), (2, 1),
-            ]
-            for dr, dc in knight_offsets:
-                new_rank = attacker_sq.rank() + dr
-                new_file = attacker_sq.file() + dc
-                if 0 <= new_rank < 8 and 0 <= new_file < 8:
-                    check_sq = Square(new_rank * 8 + new_file)
-                    if check_sq == target_sq:
-                        return True
-        elif attacker.piece_type in [PieceType.BISHOP, PieceType.QUEEN]:
-            directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-            for dr, dc in directions:
-                for i in range(1, 8):
-                    new_rank = attacker_sq.rank() + dr * i
-                    new_file = attacker_sq.file() + dc * i
-                    if not (0 <= new_rank < 8 and 0 <= new_file < 8):
-                        break
-                    check_sq = Square(new_rank * 8 + new_file)
-                    if check_sq == target_sq:
-                        return True
-                    if position.get_piece(check_sq) is not None:
-                        break
-        elif attacker.piece_type in [PieceType.ROOK, PieceType.QUEEN]:
-            directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-            for dr, dc in directions:
-                for i in range(1, 8):
-                    new_rank = attacker_sq.rank() + dr * i
-                    new_file = attacker_sq.file() + dc * i
-                    if not (0 <= new_rank < 8 and 0 <= new_file < 8):
-                        break
-                    check_sq = Square(new_rank * 8 + new_file)
-                    if check_sq == target_sq:
-                        return True
-                    if position.get_piece(check_sq) is not None:
-                        break
+            return bool(KNIGHT_ATTACKS[attacker_sq] & target_bb)
         elif attacker.piece_type == PieceType.KING:
-            for dr in [-1, 0, 1]:
-                for dc in [-1, 0, 1]:
-                    if dr == 0 and dc == 0:
-                        continue
-                    new_rank = attacker_sq.rank() + dr
-                    new_file = attacker_sq.file() + dc
-                    if 0 <= new_rank < 8 and 0 <= new_file < 8:
-                        check_sq = Square(new_rank * 8 + new_file)
-                        if check_sq == target_sq:
-                            return True
-
-        return False
\ No newline at end of file
+            return bool(KING_ATTACKS[attacker_sq] & target_bb)
+        elif attacker.piece_type == PieceType.BISHOP:
+            return bool(bishop_attacks(attacker_sq, position.occupied_all) & target_bb)
+        elif attacker.piece_type == PieceType.ROOK:
+            return bool(rook_attacks(attacker_sq, position.occupied_all) & target_bb)
+        elif attacker.piece_type == PieceType.QUEEN:
+            return bool(queen_attacks(attacker_sq, position.occupied_all) & target_bb)
+
+        return False
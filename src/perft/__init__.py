@@ -0,0 +1,7 @@
+"""
+Perft module
+"""
+
+from .perft import PERFT_SUITE, PerftTable, perft, divide, print_divide, run_suite
+
+__all__ = ["PERFT_SUITE", "PerftTable", "perft", "divide", "print_divide", "run_suite"]
@@ -0,0 +1,200 @@
+"""
+Perft: count leaf nodes of the legal move tree
+Similar to Stockfish's perft.h and benchmark.{h,cpp}
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from ..position import Position
+from ..movegen import MoveGenerator
+from ..type_defs.chess_types import move_to_uci
+
+
+# Reference positions with expected node counts, one per depth from 1
+PERFT_SUITE = [
+    (
+        "startpos",
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        [20, 400, 8902, 197281, 4865609, 119060324],
+    ),
+    (
+        "kiwipete",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        [48, 2039, 97862, 4085603, 193690690],
+    ),
+    (
+        "position3",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        [14, 191, 2812, 43238, 674624, 11030083],
+    ),
+    (
+        "position4",
+        "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        [6, 264, 9467, 422333, 15833292],
+    ),
+    (
+        "position5",
+        "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        [44, 1486, 62379, 2103487, 89941194],
+    ),
+    (
+        "position6",
+        "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        [46, 2079, 89890, 3894594, 164075551],
+    ),
+]
+
+
+class PerftTable:
+    """
+    Fixed-size perft hash table, one entry per slot, always replaced.
+    Entries are verified against the full key and the remaining depth.
+    """
+
+    def __init__(self, size_mb: int = 16):
+        # Roughly 64 bytes per slot across the three lists
+        slots = max(1, (size_mb * 1024 * 1024) // 64)
+        self.size = 1 << (slots.bit_length() - 1)
+        self.mask = self.size - 1
+        self.keys: List[int] = [0] * self.size
+        self.depths: List[int] = [0] * self.size
+        self.counts: List[int] = [0] * self.size
+
+    def probe(self, key: int, depth: int) -> Optional[int]:
+        """Get the stored count for key at depth, None on a miss"""
+        index = key & self.mask
+        if self.keys[index] == key and self.depths[index] == depth:
+            return self.counts[index]
+        return None
+
+    def store(self, key: int, depth: int, count: int) -> None:
+        """Store the count for key at depth"""
+        index = key & self.mask
+        self.keys[index] = key
+        self.depths[index] = depth
+        self.counts[index] = count
+
+
+def perft(position: Position, depth: int, table: Optional[PerftTable] = None) -> int:
+    """
+    Count leaf nodes depth plies below position. The last ply is bulk
+    counted: the number of legal moves is taken without playing them.
+    """
+    if depth <= 0:
+        return 1
+
+    moves = MoveGenerator(position).generate_legal_moves()
+    if depth == 1:
+        return len(moves)
+
+    if table is not None:
+        cached = table.probe(position.key, depth)
+        if cached is not None:
+            return cached
+
+    nodes = 0
+    for move in moves:
+        position.make_move(move)
+        nodes += perft(position, depth - 1, table)
+        position.unmake_move()
+
+    if table is not None:
+        table.store(position.key, depth, nodes)
+
+    return nodes
+
+
+def _perft_worker(fen: str, move: int, depth: int, hash_mb: int) -> int:
+    """Count one root move from a fresh position in a worker process"""
+    position = Position(fen)
+    position.make_move(move)
+    table = PerftTable(hash_mb) if hash_mb else None
+    return perft(position, depth - 1, table)
+
+
+def divide(
+    position: Position,
+    depth: int,
+    hash_mb: int = 0,
+    workers: int = 1
+) -> List[Tuple[int, int]]:
+    """
+    Count leaf nodes below each root move. With workers > 1 the root
+    moves are split across a process pool, each worker with its own
+    hash table when hash_mb is set.
+    """
+    moves = list(MoveGenerator(position).generate_legal_moves())
+    if depth <= 1:
+        return [(move, 1) for move in moves]
+
+    if workers > 1 and len(moves) > 1:
+        fen = position.to_fen()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_perft_worker, fen, move, depth, hash_mb)
+                for move in moves
+            ]
+            return [(move, future.result()) for move, future in zip(moves, futures)]
+
+    table = PerftTable(hash_mb) if hash_mb else None
+    results = []
+    for move in moves:
+        position.make_move(move)
+        results.append((move, perft(position, depth - 1, table)))
+        position.unmake_move()
+    return results
+
+
+def print_divide(
+    position: Position,
+    depth: int,
+    hash_mb: int = 0,
+    workers: int = 1
+) -> int:
+    """Print divide output in Stockfish's format and return the node count"""
+    start = time.time()
+    results = divide(position, depth, hash_mb, workers)
+    elapsed = time.time() - start
+
+    nodes = 0
+    for move, count in results:
+        print(f"{move_to_uci(move)}: {count}")
+        nodes += count
+
+    print()
+    print(f"Nodes searched: {nodes}")
+    if elapsed > 0:
+        print(f"Time: {elapsed:.2f}s ({int(nodes / elapsed)} nps)")
+    return nodes
+
+
+def run_suite(max_nodes: int = 1000000, hash_mb: int = 0, workers: int = 1) -> bool:
+    """
+    Run the reference suite, going as deep in each position as max_nodes
+    allows. Prints one line per position and returns True if all match.
+    """
+    passed = True
+    total_nodes = 0
+    start = time.time()
+
+    for name, fen, expected_counts in PERFT_SUITE:
+        depth = 1
+        while depth < len(expected_counts) and expected_counts[depth] <= max_nodes:
+            depth += 1
+        expected = expected_counts[depth - 1]
+
+        position = Position(fen)
+        nodes = sum(count for _, count in divide(position, depth, hash_mb, workers))
+        total_nodes += nodes
+
+        ok = nodes == expected
+        passed = passed and ok
+        status = "OK" if ok else "FAIL"
+        print(f"[{status}] {name} depth {depth}: {nodes} (expected {expected})")
+
+    elapsed = time.time() - start
+    if elapsed > 0:
+        print(f"Total: {total_nodes} nodes in {elapsed:.2f}s ({int(total_nodes / elapsed)} nps)")
+    return passed
@@ -3,10 +3,55 @@ Position/Board representation
 Similar to Stockfish's position.{h,cpp}
 """
 
-from typing import List, Optional, Dict, Tuple
-import copy
-
-from ..type_defs.chess_types import Color, PieceType, Piece, Square, Move, MoveFlag
+from typing import List, Optional, Tuple
+import random
+
+from ..type_defs.chess_types import (
+    Color, PieceType, Piece, Square, MoveFlag, MOVE_NONE, PROMOTION_BIT,
+    WHITE_OO, WHITE_OOO, BLACK_OO, BLACK_OOO, ALL_CASTLING,
+)
+from ..bitboard import (
+    SQUARE_BB, KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS,
+    rook_attacks, bishop_attacks, iter_squares,
+)
+
+
+# Shared piece instances, indexed [color][piece_type]
+PIECES = [[Piece(color, piece_type) for piece_type in PieceType] for color in Color]
+
+PIECE_CHARS = {
+    'p': PieceType.PAWN,
+    'n': PieceType.KNIGHT,
+    'b': PieceType.BISHOP,
+    'r': PieceType.ROOK,
+    'q': PieceType.QUEEN,
+    'k': PieceType.KING,
+}
+
+
+# Castling rights lost when a move starts or ends on a square
+CASTLING_RIGHTS_CLEARED = [0] * 64
+CASTLING_RIGHTS_CLEARED[Square.E1] = WHITE_OO | WHITE_OOO
+CASTLING_RIGHTS_CLEARED[Square.H1] = WHITE_OO
+CASTLING_RIGHTS_CLEARED[Square.A1] = WHITE_OOO
+CASTLING_RIGHTS_CLEARED[Square.E8] = BLACK_OO | BLACK_OOO
+CASTLING_RIGHTS_CLEARED[Square.H8] = BLACK_OO
+CASTLING_RIGHTS_CLEARED[Square.A8] = BLACK_OOO
+
+CASTLING_CHARS = [(WHITE_OO, 'K'), (WHITE_OOO, 'Q'), (BLACK_OO, 'k'), (BLACK_OOO, 'q')]
+
+# Zobrist keys, generated from a fixed seed so keys are stable across runs
+_zobrist_rng = random.Random(0x5A0B1A57)
+
+# ZOBRIST_PIECES[color][piece_type][square]
+ZOBRIST_PIECES = [
+    [[_zobrist_rng.getrandbits(64) for _ in range(64)] for _ in PieceType]
+    for _ in Color
+]
+# Indexed by the castling rights mask
+ZOBRIST_CASTLING = [_zobrist_rng.getrandbits(64) for _ in range(16)]
+ZOBRIST_EN_PASSANT = [_zobrist_rng.getrandbits(64) for _ in range(8)]
+ZOBRIST_SIDE = _zobrist_rng.getrandbits(64)
 
 
 class Position:
@@ -15,65 +60,47 @@ class Position:
     def __init__(self, fen: Optional[str] = None):
         """Initialize position from FEN string or starting position"""
         self.board: List[Optional[Piece]] = [None] * 64
+        # One bitboard per color and piece type: pieces[color][piece_type]
+        self.pieces: List[List[int]] = [[0] * 6, [0] * 6]
+        # Occupancy per color, and of both colors
+        self.occupied: List[int] = [0, 0]
+        self.occupied_all: int = 0
+        # Cached king square per color, None if the king is missing
+        self.king_squares: List[Optional[int]] = [None, None]
         self.turn: Color = Color.WHITE
-        self.castling: Dict[Color, Dict[str, bool]] = {
-            Color.WHITE: {"king": True, "queen": True},
-            Color.BLACK: {"king": True, "queen": True},
-        }
-        self.en_passant: Optional[Square] = None
+        # Castling rights bitmask (WHITE_OO | WHITE_OOO | BLACK_OO | BLACK_OOO)
+        self.castling: int = ALL_CASTLING
+        self.en_passant: Optional[int] = None
         self.halfmove_clock: int = 0
         self.fullmove_number: int = 1
+        # Zobrist hash of the position, maintained incrementally
+        self.key: int = 0
+        # Undo records pushed by make_move and popped by unmake_move
+        self.history: List[Tuple] = []
 
         if fen:
             self.load_fen(fen)
         else:
             self.reset()
 
-    def reset(self) -> None:
-        """Reset to starting position"""
-        # Clear board
+    def clear(self) -> None:
+        """Remove all pieces from the board"""
         self.board = [None] * 64
+        self.pieces = [[0] * 6, [0] * 6]
+        self.occupied = [0, 0]
+        self.occupied_all = 0
+        self.king_squares = [None, None]
+        self.key = 0
+        self.history = []
 
-        # Place pieces
-        # Black pieces
-        self.board[Square.A8] = Piece(Color.BLACK, PieceType.ROOK)
-        self.board[Square.B8] = Piece(Color.BLACK, PieceType.KNIGHT)
-        self.board[Square.C8] = Piece(Color.BLACK, PieceType.BISHOP)
-        self.board[Square.D8] = Piece(Color.BLACK, PieceType.QUEEN)
-        self.board[Square.E8] = Piece(Color.BLACK, PieceType.KING)
-        self.board[Square.F8] = Piece(Color.BLACK, PieceType.BISHOP)
-        self.board[Square.G8] = Piece(Color.BLACK, PieceType.KNIGHT)
-        self.board[Square.H8] = Piece(Color.BLACK, PieceType.ROOK)
-
-        for file in range(8):
-            self.board[Square.A7 + file] = Piece(Color.BLACK, PieceType.PAWN)
-
-        # White pieces
-        for file in range(8):
-            self.board[Square.A2 + file] = Piece(Color.WHITE, PieceType.PAWN)
-
-        self.board[Square.A1] = Piece(Color.WHITE, PieceType.ROOK)
-        self.board[Square.B1] = Piece(Color.WHITE, PieceType.KNIGHT)
-        self.board[Square.C1] = Piece(Color.WHITE, PieceType.BISHOP)
-        self.board[Square.D1] = Piece(Color.WHITE, PieceType.QUEEN)
-        self.board[Square.E1] = Piece(Color.WHITE, PieceType.KING)
-        self.board[Square.F1] = Piece(Color.WHITE, PieceType.BISHOP)
-        self.board[Square.G1] = Piece(Color.WHITE, PieceType.KNIGHT)
-        self.board[Square.H1] = Piece(Color.WHITE, PieceType.ROOK)
-
-        # Reset state
-        self.turn = Color.WHITE
-        self.castling = {
-            Color.WHITE: {"king": True, "queen": True},
-            Color.BLACK: {"king": True, "queen": True},
-        }
-        self.en_passant = None
-        self.halfmove_clock = 0
-        self.fullmove_number = 1
+    def reset(self) -> None:
+        """Reset to starting position"""
+        self.load_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
 
     def load_fen(self, fen: str) -> None:
         """Load position from FEN string"""
         parts = fen.split()
+        self.clear()
 
         # Parse board
         board_part = parts[0]
@@ -87,58 +114,51 @@ class Position:
             elif c.isdigit():
                 file += int(c)
             else:
-                # Determine color
                 color = Color.WHITE if c.isupper() else Color.BLACK
-
-                # Determine piece type
-                piece_char = c.lower()
-                piece_type_map = {
-                    'p': PieceType.PAWN,
-                    'n': PieceType.KNIGHT,
-                    'b': PieceType.BISHOP,
-                    'r': PieceType.ROOK,
-                    'q': PieceType.QUEEN,
-                    'k': PieceType.KING,
-                }
-                piece_type = piece_type_map[piece_char]
-
-                # Place piece
-                square = rank * 8 + file
-                self.board[square] = Piece(color, piece_type)
+                piece_type = PIECE_CHARS[c.lower()]
+                self._put_piece(rank * 8 + file, color, piece_type)
                 file += 1
 
         # Parse turn
+        self.turn = Color.WHITE
         if len(parts) > 1:
             self.turn = Color.WHITE if parts[1] == 'w' else Color.BLACK
 
         # Parse castling
+        self.castling = 0
         if len(parts) > 2:
-            castling_part = parts[2]
-            self.castling = {
-                Color.WHITE: {"king": False, "queen": False},
-                Color.BLACK: {"king": False, "queen": False},
-            }
-
-            if 'K' in castling_part:
-                self.castling[Color.WHITE]["king"] = True
-            if 'Q' in castling_part:
-                self.castling[Color.WHITE]["queen"] = True
-            if 'k' in castling_part:
-                self.castling[Color.BLACK]["king"] = True
-            if 'q' in castling_part:
-                self.castling[Color.BLACK]["queen"] = True
+            for right, char in CASTLING_CHARS:
+                if char in parts[2]:
+                    self.castling |= right
 
         # Parse en passant
         if len(parts) > 3 and parts[3] != '-':
-            self.en_passant = Square.from_string(parts[3])
+            self.en_passant = int(Square.from_string(parts[3]))
         else:
             self.en_passant = None
 
         # Parse clocks
-        if len(parts) > 4:
-            self.halfmove_clock = int(parts[4])
-        if len(parts) > 5:
-            self.fullmove_number = int(parts[5])
+        self.halfmove_clock = int(parts[4]) if len(parts) > 4 else 0
+        self.fullmove_number = int(parts[5]) if len(parts) > 5 else 1
+
+        self.key = self.compute_key()
+
+    def compute_key(self) -> int:
+        """Compute the Zobrist key from scratch"""
+        key = 0
+        for square, piece in enumerate(self.board):
+            if piece is not None:
+                key ^= ZOBRIST_PIECES[piece.color][piece.piece_type][square]
+
+        key ^= ZOBRIST_CASTLING[self.castling]
+
+        if self.en_passant is not None:
+            key ^= ZOBRIST_EN_PASSANT[self.en_passant & 7]
+
+        if self.turn == Color.BLACK:
+            key ^= ZOBRIST_SIDE
+
+        return key
 
     def to_fen(self) -> str:
         """Convert position to FEN string"""
@@ -149,8 +169,7 @@ class Position:
         for rank in range(7, -1, -1):
             empty_count = 0
             for file in range(8):
-                square = rank * 8 + file
-                piece = self.board[square]
+                piece = self.board[rank * 8 + file]
 
                 if piece is None:
                     empty_count += 1
@@ -163,8 +182,6 @@ class Position:
                     piece_char = str(piece.piece_type)
                     if piece.color == Color.BLACK:
                         piece_char = piece_char.lower()
-                    else:
-                        piece_char = piece_char.upper()
 
                     board_str += piece_char
 
@@ -180,15 +197,7 @@ class Position:
         fen_parts.append('w' if self.turn == Color.WHITE else 'b')
 
         # Castling
-        castling_str = ""
-        if self.castling[Color.WHITE]["king"]:
-            castling_str += 'K'
-        if self.castling[Color.WHITE]["queen"]:
-            castling_str += 'Q'
-        if self.castling[Color.BLACK]["king"]:
-            castling_str += 'k'
-        if self.castling[Color.BLACK]["queen"]:
-            castling_str += 'q'
+        castling_str = "".join(char for right, char in CASTLING_CHARS if self.castling & right)
 
         if not castling_str:
             castling_str = '-'
@@ -196,8 +205,8 @@ class Position:
         fen_parts.append(castling_str)
 
         # En passant
-        if self.en_passant:
-            fen_parts.append(str(self.en_passant))
+        if self.en_passant is not None:
+            fen_parts.append(str(Square(self.en_passant)))
         else:
             fen_parts.append('-')
 
@@ -209,45 +218,171 @@ class Position:
 
     def get_piece(self, square: Square) -> Optional[Piece]:
         """Get piece at square"""
-        return self.board[square.value]
+        return self.board[square]
 
     def set_piece(self, square: Square, piece: Optional[Piece]) -> None:
         """Set piece at square"""
-        self.board[square.value] = piece
-
-    def make_move(self, move: Move) -> None:
-        """Make a move on the board"""
-        from_sq = move.from_sq
-        to_sq = move.to_sq
-        piece = self.get_piece(from_sq)
+        if self.board[square] is not None:
+            self._remove_piece(square)
+        if piece is not None:
+            self._put_piece(square, piece.color, piece.piece_type)
+
+    def pieces_of(self, color: Color, piece_type: PieceType) -> int:
+        """Get bitboard of pieces of given color and type"""
+        return self.pieces[color][piece_type]
+
+    def king_square(self, color: Color) -> Optional[int]:
+        """Get square of color's king, or None if it is missing"""
+        return self.king_squares[color]
+
+    def attackers_to(self, square: int, occupied: Optional[int] = None) -> int:
+        """
+        Get bitboard of pieces of both colors attacking square.
+        Sliders are blocked by occupied, which defaults to the board.
+        """
+        if occupied is None:
+            occupied = self.occupied_all
+        white = self.pieces[Color.WHITE]
+        black = self.pieces[Color.BLACK]
+        return (
+            (PAWN_ATTACKS[Color.BLACK][square] & white[PieceType.PAWN])
+            | (PAWN_ATTACKS[Color.WHITE][square] & black[PieceType.PAWN])
+            | (KNIGHT_ATTACKS[square] & (white[PieceType.KNIGHT] | black[PieceType.KNIGHT]))
+            | (KING_ATTACKS[square] & (white[PieceType.KING] | black[PieceType.KING]))
+            | (bishop_attacks(square, occupied) & (
+                white[PieceType.BISHOP] | black[PieceType.BISHOP]
+                | white[PieceType.QUEEN] | black[PieceType.QUEEN]))
+            | (rook_attacks(square, occupied) & (
+                white[PieceType.ROOK] | black[PieceType.ROOK]
+                | white[PieceType.QUEEN] | black[PieceType.QUEEN]))
+        )
+
+    def is_square_attacked(
+        self, square: int, by_color: Color, occupied: Optional[int] = None
+    ) -> bool:
+        """
+        Check if by_color attacks square, probing outward from the square
+        along knight, pawn, king and slider lines and stopping at the first hit.
+        Sliders are blocked by occupied, which defaults to the board.
+        """
+        theirs = self.pieces[by_color]
+
+        if KNIGHT_ATTACKS[square] & theirs[PieceType.KNIGHT]:
+            return True
+        if PAWN_ATTACKS[by_color ^ 1][square] & theirs[PieceType.PAWN]:
+            return True
+        if KING_ATTACKS[square] & theirs[PieceType.KING]:
+            return True
+
+        if occupied is None:
+            occupied = self.occupied_all
+        queens = theirs[PieceType.QUEEN]
+
+        diagonal = theirs[PieceType.BISHOP] | queens
+        if diagonal and bishop_attacks(square, occupied) & diagonal:
+            return True
+
+        straight = theirs[PieceType.ROOK] | queens
+        return bool(straight and rook_attacks(square, occupied) & straight)
+
+    def iter_pieces(self, color: Color):
+        """Iterate (square, piece) over color's pieces"""
+        board = self.board
+        for square in iter_squares(self.occupied[color]):
+            yield square, board[square]
+
+    def _put_piece(self, square: int, color: Color, piece_type: PieceType) -> None:
+        """Place a piece on an empty square"""
+        bb = SQUARE_BB[square]
+        self.board[square] = PIECES[color][piece_type]
+        self.pieces[color][piece_type] |= bb
+        self.occupied[color] |= bb
+        self.occupied_all |= bb
+        self.key ^= ZOBRIST_PIECES[color][piece_type][square]
+        if piece_type == PieceType.KING:
+            self.king_squares[color] = square
+
+    def _remove_piece(self, square: int) -> Piece:
+        """Remove and return the piece on an occupied square"""
+        piece = self.board[square]
+        bb = SQUARE_BB[square]
+        self.board[square] = None
+        self.pieces[piece.color][piece.piece_type] ^= bb
+        self.occupied[piece.color] ^= bb
+        self.occupied_all ^= bb
+        self.key ^= ZOBRIST_PIECES[piece.color][piece.piece_type][square]
+        if piece.piece_type == PieceType.KING:
+            self.king_squares[piece.color] = None
+        return piece
+
+    def _move_piece(self, from_sq: int, to_sq: int) -> None:
+        """Move a piece between squares; the target must be empty"""
+        piece = self.board[from_sq]
+        from_to = SQUARE_BB[from_sq] | SQUARE_BB[to_sq]
+        self.board[from_sq] = None
+        self.board[to_sq] = piece
+        self.pieces[piece.color][piece.piece_type] ^= from_to
+        self.occupied[piece.color] ^= from_to
+        self.occupied_all ^= from_to
+        keys = ZOBRIST_PIECES[piece.color][piece.piece_type]
+        self.key ^= keys[from_sq] ^ keys[to_sq]
+        if piece.piece_type == PieceType.KING:
+            self.king_squares[piece.color] = to_sq
+
+    def make_move(self, move: int) -> None:
+        """Make a packed move on the board, pushing an undo record"""
+        from_sq = move & 0x3F
+        to_sq = (move >> 6) & 0x3F
+        flag = move >> 12
+        piece = self.board[from_sq]
 
         if piece is None:
-            raise ValueError(f"No piece at {from_sq}")
-
-        # Move piece
-        self.set_piece(to_sq, piece)
-        self.set_piece(from_sq, None)
+            raise ValueError(f"No piece at {Square(from_sq)}")
+
+        captured = self.board[to_sq]
+        self.history.append((
+            move,
+            captured,
+            self.castling,
+            self.en_passant,
+            self.halfmove_clock,
+            self.key,
+        ))
+
+        # Move piece, removing any captured piece first
+        if captured is not None:
+            self._remove_piece(to_sq)
+        self._move_piece(from_sq, to_sq)
 
         # Handle special moves
-        if move.is_castle():
-            self._handle_castle(move)
-        elif move.is_en_passant():
-            self._handle_en_passant(move)
-        elif move.is_promotion():
-            self.set_piece(to_sq, Piece(piece.color, move.promotion))
+        if flag & PROMOTION_BIT:
+            self._remove_piece(to_sq)
+            self._put_piece(to_sq, piece.color, (flag & 3) + 1)
+        elif flag == MoveFlag.EN_PASSANT:
+            self._remove_piece((from_sq & ~7) | (to_sq & 7))
+        elif flag == MoveFlag.CASTLE_KING or flag == MoveFlag.CASTLE_QUEEN:
+            self._handle_castle(from_sq, flag)
 
         # Update castling rights
-        self._update_castling_rights(move)
+        castling = self.castling
+        if castling:
+            cleared = castling & (CASTLING_RIGHTS_CLEARED[from_sq] | CASTLING_RIGHTS_CLEARED[to_sq])
+            if cleared:
+                self.castling = castling ^ cleared
+                self.key ^= ZOBRIST_CASTLING[castling] ^ ZOBRIST_CASTLING[self.castling]
 
         # Update en passant
-        if move.is_double_pawn():
-            rank = (from_sq.rank() + to_sq.rank()) // 2
-            self.en_passant = Square(to_sq.file() * 8 + rank)
+        if self.en_passant is not None:
+            self.key ^= ZOBRIST_EN_PASSANT[self.en_passant & 7]
+
+        if flag == MoveFlag.DOUBLE_PAWN:
+            self.en_passant = (from_sq + to_sq) >> 1
+            self.key ^= ZOBRIST_EN_PASSANT[to_sq & 7]
         else:
             self.en_passant = None
 
         # Update clocks
-        if piece.piece_type == PieceType.PAWN or self.get_piece(to_sq) is not None:
+        if piece.piece_type == PieceType.PAWN or captured is not None:
             self.halfmove_clock = 0
         else:
             self.halfmove_clock += 1
@@ -257,71 +392,103 @@ class Position:
 
         # Switch turn
         self.turn = self.turn.opposite()
+        self.key ^= ZOBRIST_SIDE
+
+    def unmake_move(self) -> int:
+        """Take back the last move made, returning it"""
+        move, captured, castling, en_passant, halfmove_clock, key = self.history.pop()
+        from_sq = move & 0x3F
+        to_sq = (move >> 6) & 0x3F
+        flag = move >> 12
+
+        self.turn = self.turn.opposite()
+        if self.turn == Color.BLACK:
+            self.fullmove_number -= 1
+
+        if flag & PROMOTION_BIT:
+            self._remove_piece(to_sq)
+            self._put_piece(to_sq, self.turn, PieceType.PAWN)
+        elif flag == MoveFlag.CASTLE_KING:
+            self._move_piece(from_sq + 1, from_sq + 3)
+        elif flag == MoveFlag.CASTLE_QUEEN:
+            self._move_piece(from_sq - 1, from_sq - 4)
+
+        self._move_piece(to_sq, from_sq)
+
+        if flag == MoveFlag.EN_PASSANT:
+            self._put_piece((from_sq & ~7) | (to_sq & 7), self.turn.opposite(), PieceType.PAWN)
+        elif captured is not None:
+            self._put_piece(to_sq, captured.color, captured.piece_type)
+
+        self.castling = castling
+        self.en_passant = en_passant
+        self.halfmove_clock = halfmove_clock
+        self.key = key
+
+        return move
+
+    def make_null_move(self) -> None:
+        """
+        Pass the turn without moving, pushing an undo record. Only the side
+        to move, en passant square and clocks change. Take it back with
+        unmake_null_move.
+        """
+        self.history.append((
+            MOVE_NONE,
+            None,
+            self.castling,
+            self.en_passant,
+            self.halfmove_clock,
+            self.key,
+        ))
+
+        if self.en_passant is not None:
+            self.key ^= ZOBRIST_EN_PASSANT[self.en_passant & 7]
+            self.en_passant = None
 
-    def _handle_castle(self, move: Move) -> None:
-        """Handle castling"""
-        if move.flag == MoveFlag.CASTLE_KING:
-            # Kingside castle
-            rank = move.from_sq.rank()
-            rook_from = Square(rank * 8 + 7)  # h-file
-            rook_to = Square(rank * 8 + 5)    # f-file
-            rook = self.get_piece(rook_from)
-            self.set_piece(rook_to, rook)
-            self.set_piece(rook_from, None)
-        elif move.flag == MoveFlag.CASTLE_QUEEN:
-            # Queenside castle
-            rank = move.from_sq.rank()
-            rook_from = Square(rank * 8 + 0)  # a-file
-            rook_to = Square(rank * 8 + 3)    # d-file
-            rook = self.get_piece(rook_from)
-            self.set_piece(rook_to, rook)
-            self.set_piece(rook_from, None)
-
-    def _handle_en_passant(self, move: Move) -> None:
-        """Handle en passant capture"""
-        capture_sq = Square(move.to_sq.rank() * 8 + move.from_sq.file())
-        self.set_piece(capture_sq, None)
-
-    def _update_castling_rights(self, move: Move) -> None:
-        """Update castling rights after move"""
-        from_sq = move.from_sq
-        to_sq = move.to_sq
-        piece = self.get_piece(to_sq)
-
-        # King move
-        if piece and piece.piece_type == PieceType.KING:
-            self.castling[piece.color]["king"] = False
-            self.castling[piece.color]["queen"] = False
-
-        # Rook moves
-        if from_sq == Square.A1:
-            self.castling[Color.WHITE]["queen"] = False
-        elif from_sq == Square.H1:
-            self.castling[Color.WHITE]["king"] = False
-        elif from_sq == Square.A8:
-            self.castling[Color.BLACK]["queen"] = False
-        elif from_sq == Square.H8:
-            self.castling[Color.BLACK]["king"] = False
-
-        # Rook capture
-        if to_sq == Square.A1:
-            self.castling[Color.WHITE]["queen"] = False
-        elif to_sq == Square.H1:
-            self.castling[Color.WHITE]["king"] = False
-        elif to_sq == Square.A8:
-            self.castling[Color.BLACK]["queen"] = False
-        elif to_sq == Square.H8:
-            self.castling[Color.BLACK]["king"] = False
+        self.halfmove_clock += 1
+        if self.turn == Color.BLACK:
+            self.fullmove_number += 1
+
+        self.turn = self.turn.opposite()
+        self.key ^= ZOBRIST_SIDE
+
+    def unmake_null_move(self) -> None:
+        """Take back a null move made with make_null_move"""
+        _, _, _, en_passant, halfmove_clock, key = self.history.pop()
+
+        self.turn = self.turn.opposite()
+        if self.turn == Color.BLACK:
+            self.fullmove_number -= 1
+
+        self.en_passant = en_passant
+        self.halfmove_clock = halfmove_clock
+        self.key = key
+
+    def _handle_castle(self, king_from: int, flag: int) -> None:
+        """Move the rook for a castling move"""
+        if flag == MoveFlag.CASTLE_KING:
+            # Kingside castle: rook h-file -> f-file
+            self._move_piece(king_from + 3, king_from + 1)
+        else:
+            # Queenside castle: rook a-file -> d-file
+            self._move_piece(king_from - 4, king_from - 1)
 
     def copy(self) -> "Position":
         """Create a copy of the position"""
-        new_pos = Position()
+        new_pos = Position.__new__(Position)
         new_pos.board = self.board.copy()
+        new_pos.pieces = [self.pieces[Color.WHITE].copy(), self.pieces[Color.BLACK].copy()]
+        new_pos.occupied = self.occupied.copy()
+        new_pos.occupied_all = self.occupied_all
+        new_pos.king_squares = self.king_squares.copy()
         new_pos.turn = self.turn
-        new_pos.castling = copy.deepcopy(self.castling)
+        new_pos.castling = self.castling
         new_pos.en_passant = self.en_passant
         new_pos.halfmove_clock = self.halfmove_clock
         new_pos.fullmove_number = self.fullmove_number
+        new_pos.key = self.key
+        new_pos.history = self.history.copy()
         return new_pos
 
     def __str__(self) -> str:
@@ -337,8 +504,7 @@ class Position:
 
                 if piece is None:
                     # Light or dark square
-                    sq = Square(square)
-                    if sq.is_light_square():
+                    if (rank + file) % 2 == 1:
                         line += ". "
                     else:
                         line += "# "
@@ -347,8 +513,6 @@ class Position:
                     piece_char = str(piece.piece_type)
                     if piece.color == Color.BLACK:
                         piece_char = piece_char.lower()
-                    else:
-                        piece_char = piece_char.upper()
 
                     line += piece_char + " "
 
@@ -357,4 +521,4 @@ class Position:
         lines.append(f"  a b c d e f g h")
         lines.append(f"FEN: {self.to_fen()}")
 
-        return '\n'.join(lines)
\ No newline at end of file
+        return '\n'.join(lines)
@@ -2,6 +2,13 @@
 Search module
 """
 
-from .search import Search
+from .search import Search, MAX_PLY, MATE_SCORE, MATE_IN_MAX_PLY
+from .movepick import MovePicker
+from .see import see, see_ge
+from .timeman import TimeManager
+from .tt import TranspositionTable
 
-__all__ = ["Search"]
\ No newline at end of file
+__all__ = [
+    "Search", "MAX_PLY", "MATE_SCORE", "MATE_IN_MAX_PLY", "MovePicker",
+    "TimeManager", "TranspositionTable", "see", "see_ge",
+]
\ No newline at end of file
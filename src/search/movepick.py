@@ -0,0 +1,130 @@
+"""
+Staged move picker
+Similar to Stockfish's movepick.{h,cpp}
+"""
+
+from array import array
+from typing import Iterator, Optional, Sequence
+
+from ..position import Position
+from ..movegen import MoveGenerator
+from .see import see_ge
+from ..type_defs.chess_types import PieceType, MoveFlag, MOVE_NONE, PROMOTION_BIT, PIECE_VALUES
+
+
+# Victim value per piece type, indexed by PieceType
+VICTIM_VALUES = [PIECE_VALUES[piece_type] for piece_type in PieceType]
+
+
+# History scores are kept within [-HISTORY_MAX, HISTORY_MAX]
+HISTORY_MAX = 16384
+
+
+def capture_score(board, move: int) -> int:
+    """
+    MVV-LVA score of a capture: victim value first, least valuable attacker
+    breaking ties. Queen promotions count as a gain.
+    """
+    victim = board[(move >> 6) & 0x3F]
+    value = VICTIM_VALUES[victim.piece_type] if victim is not None else VICTIM_VALUES[PieceType.PAWN]
+    if move >> 12 & PROMOTION_BIT:
+        value += VICTIM_VALUES[PieceType.QUEEN]
+    return value * 8 - board[move & 0x3F].piece_type
+
+
+def butterfly_index(color: int, move: int) -> int:
+    """Index of a move in a butterfly table: [color][from * 64 + to]"""
+    return color << 12 | (move & 0xFFF)
+
+
+def piece_to_index(color: int, piece_type: int, square: int) -> int:
+    """Index of a piece arriving on square in a [color][piece_type][to] table"""
+    return (color * 6 + piece_type) << 6 | square
+
+
+def update_history(history: array, index: int, bonus: int) -> None:
+    """Apply bonus to a history entry, damped so it saturates at HISTORY_MAX"""
+    history[index] += bonus - history[index] * abs(bonus) // HISTORY_MAX
+
+
+class MovePicker:
+    """
+    Yield legal moves lazily in stages: hash move, good captures (MVV-LVA),
+    killers, countermove, quiets by history score, then bad captures. A
+    stage is generated only once the previous one is exhausted, so a cutoff
+    on an early move skips the rest.
+    """
+
+    def __init__(
+        self,
+        position: Position,
+        hash_move: int = MOVE_NONE,
+        killers: Sequence[int] = (),
+        history: Optional[array] = None,
+        countermove: int = MOVE_NONE
+    ):
+        self.position = position
+        self.hash_move = hash_move
+        self.killers = killers
+        self.history = history
+        self.countermove = countermove
+
+    def __iter__(self) -> Iterator[int]:
+        position = self.position
+        board = position.board
+        movegen = MoveGenerator(position)
+        checkers = movegen.checkers()
+        pinned = movegen.pinned_pieces(position.turn)
+
+        # Hash move, only if it is legal here
+        hash_move = self.hash_move
+        if hash_move and movegen.is_pseudo_legal(hash_move) and \
+                movegen.is_legal(hash_move, checkers, pinned):
+            yield hash_move
+        else:
+            hash_move = MOVE_NONE
+
+        # Good captures, most valuable victim first; captures losing
+        # material on the exchange are kept for last
+        bad_captures = []
+        for move in self._sorted_captures(movegen.generate_legal_captures()):
+            if move == hash_move:
+                continue
+            if self._is_bad_capture(move):
+                bad_captures.append(move)
+                continue
+            yield move
+
+        # Killers: quiet moves that caused a cutoff at this ply elsewhere,
+        # then the move that last refuted the opponent's previous move
+        refutations = []
+        for move in (*self.killers, self.countermove):
+            if (move and move != hash_move and move not in refutations
+                    and board[(move >> 6) & 0x3F] is None
+                    and (move >> 12) in (MoveFlag.NORMAL, MoveFlag.DOUBLE_PAWN)
+                    and movegen.is_pseudo_legal(move)
+                    and movegen.is_legal(move, checkers, pinned)):
+                refutations.append(move)
+                yield move
+
+        # Quiets, best history score first
+        quiets = movegen.generate_legal_quiets()
+        history = self.history
+        if history is not None:
+            offset = position.turn << 12
+            quiets = sorted(quiets, key=lambda move: history[offset | (move & 0xFFF)], reverse=True)
+        for move in quiets:
+            if move != hash_move and move not in refutations:
+                yield move
+
+        # Bad captures
+        yield from bad_captures
+
+    def _sorted_captures(self, moves) -> list:
+        """Order captures by victim value, queen promotions counting as a gain"""
+        board = self.position.board
+        return sorted(moves, key=lambda move: capture_score(board, move), reverse=True)
+
+    def _is_bad_capture(self, move: int) -> bool:
+        """A capture that loses material on the static exchange"""
+        return not see_ge(self.position, move)
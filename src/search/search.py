@@ -3,100 +3,196 @@ Search algorithm with alpha-beta pruning
 Similar to Stockfish's search.{h,cpp}
 """
 
-import time
-from typing import Optional, List, Dict, Tuple
+import math
+from array import array
+from typing import Callable, Optional, List, Tuple
 import random
 
 from ..position import Position
-from ..type_defs.chess_types import Color, Move, MoveFlag
+from ..type_defs.chess_types import Color, PieceType, Move, MoveFlag, MOVE_NONE, PROMOTION_BIT
 from ..movegen import MoveGenerator
 from ..evaluation import Evaluator
+from .movepick import (
+    MovePicker, capture_score, butterfly_index, piece_to_index, update_history,
+)
+from .see import see_ge
+from .timeman import TimeManager
+from .tt import TranspositionTable, BOUND_UPPER, BOUND_LOWER, BOUND_EXACT
 import config
 
 
-class TranspositionEntry:
-    """Transposition table entry"""
+# Deepest ply tracked by per-ply search tables
+MAX_PLY = 128
 
-    def __init__(
-        self,
-        hash_key: int,
-        score: int,
-        depth: int,
-        flag: str,
-        move: Optional[Move] = None
-    ):
-        self.hash_key = hash_key
-        self.score = score
-        self.depth = depth
-        self.flag = flag  # 'exact', 'lower', 'upper'
-        self.move = move
+# Score of mate at the root; mate in n plies scores MATE_SCORE - n
+MATE_SCORE = 100000
+# Scores beyond this are mates found within the search
+MATE_IN_MAX_PLY = MATE_SCORE - MAX_PLY
+
+# Late move reductions, indexed [depth][move_number], capped at 63 for both
+LMR_TABLE = [
+    [
+        int(config.LMR_BASE + math.log(depth) * math.log(count) / config.LMR_DIVISOR)
+        if depth and count else 0
+        for count in range(64)
+    ]
+    for depth in range(64)
+]
+
+
+def score_to_tt(score: int, ply: int) -> int:
+    """Make a mate score relative to the node, for storing in the table"""
+    if score >= MATE_IN_MAX_PLY:
+        return score + ply
+    if score <= -MATE_IN_MAX_PLY:
+        return score - ply
+    return score
+
+
+def score_from_tt(score: int, ply: int) -> int:
+    """Make a mate score from the table relative to the root again"""
+    if score >= MATE_IN_MAX_PLY:
+        return score - ply
+    if score <= -MATE_IN_MAX_PLY:
+        return score + ply
+    return score
 
 
 class Search:
     """Alpha-beta search with transposition table"""
 
-    def __init__(self, position: Position):
+    def __init__(self, position: Position, tt: Optional[TranspositionTable] = None):
+        # Searched in place with make/unmake; restored when the search returns
         self.position = position
         self.evaluator = Evaluator()
         self.nodes_searched = 0
-        self.transposition_table: Dict[int, TranspositionEntry] = {}
+        # Shared with the caller when given, so it persists between searches
+        self.tt = tt if tt is not None else TranspositionTable(config.UCI_HASH)
+        # Set when the search must unwind, by the clock or from another
+        # thread; every node then returns at once
+        self.stopped = False
+        self.time_manager: Optional[TimeManager] = None
+        # Replaces time_manager at the next clock check, e.g. on ponderhit
+        self.pending_time_manager: Optional[TimeManager] = None
+        # Called as info_callback(depth, score, move) after each iteration
+        self.info_callback: Optional[Callable[[int, float, int], None]] = None
+        # Two killer moves per ply: quiet moves that caused a beta cutoff
+        self.killers: List[List[int]] = [[MOVE_NONE, MOVE_NONE] for _ in range(MAX_PLY)]
+        # Butterfly history of quiet moves, [color][from * 64 + to]
+        self.history = array('i', bytes(4 * 2 * 64 * 64))
+        # Quiet move that refuted the previous move, [color][piece_type][to]
+        self.countermoves = array('H', bytes(2 * 2 * 6 * 64))
 
     def find_best_move(
         self,
         depth: int = config.SEARCH_DEPTH,
-        time_limit: float = config.SEARCH_TIME
+        time_limit: float = config.SEARCH_TIME,
+        time_manager: Optional[TimeManager] = None
     ) -> Optional[Move]:
-        """Find best move using iterative deepening"""
-        start_time = time.time()
+        """
+        Find best move using iterative deepening, within time_limit seconds
+        or the limits of time_manager when one is given
+        """
+        if time_manager is None:
+            time_manager = TimeManager(time_limit, time_limit)
+        self.time_manager = time_manager
+        self.stopped = False
         best_move = None
+        score = 0
+        self.tt.new_search()
+        self.killers = [[MOVE_NONE, MOVE_NONE] for _ in range(MAX_PLY)]
 
         # Iterative deepening
         for current_depth in range(1, depth + 1):
-            # Check time limit
-            if time.time() - start_time > time_limit:
-                break
+            # Age history so the previous iteration weighs less
+            self._age_history()
 
             # Search at current depth
-            move, score = self.search(current_depth)
+            move, iteration_score = self._aspiration_search(current_depth, score if best_move else None)
+
+            # An interrupted iteration is only used when nothing else is known
+            if self.stopped:
+                if best_move is None:
+                    best_move = move
+                break
 
-            if move:
+            score = iteration_score
+            if move is not None:
                 best_move = move
+                self.time_manager.record_iteration(move)
+                if self.info_callback is not None:
+                    self.info_callback(current_depth, score, move)
+
+            # Stop early, sooner while the best move stays the same
+            self._apply_pending_time_manager()
+            if self.time_manager.soft_limit_reached():
+                break
 
             # Check for checkmate
-            if abs(score) > 10000:
+            if abs(score) >= MATE_IN_MAX_PLY:
                 break
 
-        return best_move
+        return Move.from_int(best_move) if best_move is not None else None
+
+    def _aspiration_search(
+        self, depth: int, previous_score: Optional[float]
+    ) -> Tuple[Optional[int], float]:
+        """
+        Search depth in a narrow window around the previous iteration's
+        score, widening the side that fails until the score falls inside
+        """
+        delta = config.ASPIRATION_WINDOW
+        if previous_score is None or depth < config.ASPIRATION_MIN_DEPTH or abs(previous_score) >= MATE_IN_MAX_PLY:
+            return self.search(depth)
+
+        alpha = previous_score - delta
+        beta = previous_score + delta
+        while True:
+            move, score = self.search(depth, alpha, beta)
+            if self.stopped:
+                return move, score
+            if score <= alpha:
+                # Fail low: keep beta, open alpha
+                alpha = score - delta
+            elif score >= beta:
+                # Fail high: keep alpha, open beta
+                beta = score + delta
+            else:
+                return move, score
+
+            delta *= 2
+            if delta > config.ASPIRATION_MAX_WINDOW:
+                return self.search(depth)
 
-    def search(self, depth: int) -> Tuple[Optional[Move], int]:
-        """Search at given depth"""
+    def search(
+        self,
+        depth: int,
+        alpha: float = -float('inf'),
+        beta: float = float('inf')
+    ) -> Tuple[Optional[int], int]:
+        """Search at given depth within the (alpha, beta) window"""
+        position = self.position
         moves = self._get_ordered_moves()
 
         if not moves:
             # No moves - checkmate or stalemate
             if self._is_check(self.position.turn):
-                return None, -100000 + self.position.fullmove_number
+                return None, -MATE_SCORE
             else:
                 return None, 0
 
-        alpha = -float('inf')
-        beta = float('inf')
+        original_alpha = alpha
         best_move = moves[0]
         best_score = -float('inf')
 
-        for move in moves:
-            # Make move
-            new_pos = self.position.copy()
-            new_pos.make_move(move)
-
-            # Search
-            score = -self._alpha_beta(
-                new_pos,
-                depth - 1,
-                -beta,
-                -alpha,
-                self.position.turn.opposite()
-            )
+        for index, move in enumerate(moves):
+            position.make_move(move)
+            score = self._pvs(depth - 1, alpha, beta, 1, index == 0)
+            position.unmake_move()
+
+            # Scores of an interrupted search are meaningless
+            if self.stopped:
+                break
 
             # Update best move
             if score > best_score:
@@ -110,114 +206,292 @@ class Search:
             if alpha >= beta:
                 break
 
+        if self.stopped:
+            return best_move, best_score
+
+        # Keep the root's best move first for the next iteration
+        if best_score >= beta:
+            bound = BOUND_LOWER
+        elif best_score > original_alpha:
+            bound = BOUND_EXACT
+        else:
+            bound = BOUND_UPPER
+        self.tt.store(position.key, best_score, depth, bound, best_move)
+
         return best_move, best_score
 
     def _alpha_beta(
         self,
-        position: Position,
         depth: int,
         alpha: float,
         beta: float,
-        color: Color
+        ply: int,
+        allow_null: bool = True
     ) -> int:
-        """Alpha-beta search"""
-        self.nodes_searched += 1
+        """Alpha-beta search on self.position, which is restored on return"""
+        if self._poll_stop():
+            return 0
+        position = self.position
 
-        # Check transposition table
-        hash_key = self._hash_position(position)
-        entry = self.transposition_table.get(hash_key)
+        if ply >= MAX_PLY:
+            return self._static_eval(position)
 
-        if entry and entry.depth >= depth:
-            if entry.flag == 'exact':
-                return entry.score
-            elif entry.flag == 'lower' and entry.score >= beta:
-                return entry.score
-            elif entry.flag == 'upper' and entry.score <= alpha:
-                return entry.score
+        # Mate distance pruning: no line from here beats a mate already
+        # found closer to the root
+        alpha = max(alpha, -MATE_SCORE + ply)
+        beta = min(beta, MATE_SCORE - ply - 1)
+        if alpha >= beta:
+            return alpha
 
-        # Leaf node
-        if depth == 0:
-            score = self._quiescence_search(position, alpha, beta, color)
-            self._store_transposition(hash_key, score, depth, 'exact')
-            return score
-
-        # Generate moves
-        moves = self._get_ordered_moves(position)
+        # Check transposition table
+        tt = self.tt
+        hash_key = position.key
+        slot = tt.probe(hash_key)
+        hash_move = MOVE_NONE
+
+        if slot >= 0:
+            hash_move = tt.moves[slot]
+            if tt.depths[slot] >= depth:
+                tt_score = score_from_tt(tt.scores[slot], ply)
+                bound = tt.bound(slot)
+                if bound == BOUND_EXACT:
+                    return tt_score
+                elif bound == BOUND_LOWER and tt_score >= beta:
+                    return tt_score
+                elif bound == BOUND_UPPER and tt_score <= alpha:
+                    return tt_score
+
+        # Check extension: search evasions a ply deeper
+        in_check = self._is_check(position.turn, position)
+        if in_check:
+            depth += 1
 
-        if not moves:
-            # Checkmate or stalemate
-            if self._is_check(color, position):
-                return -100000 + (self.position.fullmove_number - position.fullmove_number)
-            else:
+        # Leaf node
+        if depth <= 0:
+            return self._quiescence_search(alpha, beta, ply)
+        is_pv = beta - alpha > 1
+        # Static eval for pruning decisions, only used at non-PV nodes out of check
+        static_eval = None if in_check or is_pv else self._static_eval(position)
+        can_prune = not is_pv and not in_check and abs(beta) < MATE_IN_MAX_PLY
+
+        # Reverse futility pruning: far enough above beta that no move of
+        # ours near the leaves will be refuted
+        if (can_prune and depth <= config.REVERSE_FUTILITY_DEPTH
+                and static_eval - config.REVERSE_FUTILITY_MARGIN * depth >= beta):
+            return static_eval
+
+        # Razoring: so far below alpha that only captures can save us
+        if (can_prune and depth <= config.RAZOR_DEPTH
+                and static_eval + config.RAZOR_MARGIN * depth < alpha):
+            score = self._quiescence_search(alpha, alpha + 1, ply)
+            if score <= alpha:
+                return score
+
+        # Null move pruning: if passing still fails high, a real move will too.
+        # Not in check, not at PV nodes, not twice in a row, and not with
+        # only pawns left, where zugzwang makes passing an illusory gain.
+        if (allow_null and depth >= config.NULL_MOVE_MIN_DEPTH and not is_pv and not in_check
+                and position.history and position.history[-1][0] != MOVE_NONE
+                and self._has_non_pawn_material(position)
+                and static_eval >= beta):
+            reduction = config.NULL_MOVE_REDUCTION + depth // 4
+            position.make_null_move()
+            score = -self._alpha_beta(depth - reduction - 1, -beta, -beta + 1, ply + 1, False)
+            position.unmake_null_move()
+            if self.stopped:
                 return 0
 
-        # Search moves
+            if score >= beta:
+                # Do not return unproven mates
+                if score >= MATE_IN_MAX_PLY:
+                    score = beta
+                if depth < config.NULL_MOVE_VERIFY_DEPTH:
+                    return score
+                # Verify at high depth with null moves disabled
+                if self._alpha_beta(depth - reduction - 1, beta - 1, beta, ply, False) >= beta:
+                    return score
+
+        # Search moves, generated lazily in stages
+        original_alpha = alpha
         best_score = -float('inf')
+        best_move = MOVE_NONE
+        killers = self.killers[ply] if ply < MAX_PLY else ()
+        board = position.board
+        history = self.history
+        counter_index = self._countermove_index(position)
+        countermove = self.countermoves[counter_index] if counter_index >= 0 else MOVE_NONE
+        quiets_tried = []
+        move_count = 0
+        lmr_row = LMR_TABLE[min(depth, 63)]
+        # Futility pruning: quiet moves cannot lift a hopeless eval to alpha
+        futile = (can_prune and depth <= config.FUTILITY_DEPTH and abs(alpha) < MATE_IN_MAX_PLY
+                  and static_eval + config.FUTILITY_MARGIN * depth <= alpha)
+
+        # The hash move is tried before any generation, so a cutoff on it
+        # skips generating the rest
+        for move in MovePicker(position, hash_move, killers, history, countermove):
+            is_quiet = (board[(move >> 6) & 0x3F] is None and move >> 12 != MoveFlag.EN_PASSANT
+                        and not move >> 12 & PROMOTION_BIT)
+            move_count += 1
+
+            position.make_move(move)
+            gives_check = is_quiet and self._is_check(position.turn, position)
+
+            # Skip futile quiet moves once one move has been searched
+            if futile and is_quiet and move_count > 1 and not gives_check:
+                position.unmake_move()
+                continue
+
+            # Late move reductions: quiet moves late in the ordering are
+            # searched shallower, less so with a good history score
+            reduction = 0
+            if (depth >= config.LMR_MIN_DEPTH and is_quiet and not in_check
+                    and move_count > config.LMR_MIN_MOVES + 2 * is_pv
+                    and move not in killers and move != countermove
+                    and not gives_check):
+                reduction = lmr_row[min(move_count, 63)] - is_pv
+                reduction -= history[butterfly_index(position.turn ^ 1, move)] // config.LMR_HISTORY_DIVISOR
+                reduction = max(0, min(reduction, depth - 2))
+
+            score = self._pvs(depth - 1, alpha, beta, ply + 1, move_count == 1, reduction)
+            position.unmake_move()
+            if self.stopped:
+                return 0
 
-        for move in moves:
-            new_pos = position.copy()
-            new_pos.make_move(move)
-
-            score = -self._alpha_beta(
-                new_pos,
-                depth - 1,
-                -beta,
-                -alpha,
-                color.opposite()
-            )
-
-            best_score = max(best_score, score)
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    best_move = move
             alpha = max(alpha, score)
 
             if alpha >= beta:
+                if is_quiet:
+                    self._update_quiet_stats(move, ply, depth, quiets_tried, counter_index)
                 break
 
-        # Store in transposition table
-        flag = 'exact'
-        if best_score <= alpha:
-            flag = 'upper'
-        elif best_score >= beta:
-            flag = 'lower'
+            if is_quiet:
+                quiets_tried.append(move)
 
-        self._store_transposition(hash_key, best_score, depth, flag)
+        if best_score == -float('inf'):
+            # No legal moves: checkmate or stalemate
+            if self._is_check(position.turn, position):
+                return -MATE_SCORE + ply
+            else:
+                return 0
+
+        # Store in transposition table, bounded against the original window
+        if best_score >= beta:
+            bound = BOUND_LOWER
+        elif best_score > original_alpha:
+            bound = BOUND_EXACT
+        else:
+            bound = BOUND_UPPER
+
+        tt.store(hash_key, score_to_tt(best_score, ply), depth, bound, best_move)
 
         return best_score
 
-    def _quiescence_search(
+    def _pvs(
         self,
-        position: Position,
+        depth: int,
         alpha: float,
         beta: float,
-        color: Color
-    ) -> int:
+        ply: int,
+        first: bool,
+        reduction: int = 0
+    ) -> float:
+        """
+        Score the move just made, from the mover's side. The first move gets
+        the full window; later moves get a null window to prove they are no
+        better than alpha, and a full re-search only when they are. A
+        reduced null-window search is repeated at full depth if it beats alpha.
+        """
+        if first:
+            return -self._alpha_beta(depth, -beta, -alpha, ply)
+
+        score = -self._alpha_beta(depth - reduction, -alpha - 1, -alpha, ply)
+        if reduction and score > alpha:
+            score = -self._alpha_beta(depth, -alpha - 1, -alpha, ply)
+        if alpha < score < beta and beta - alpha > 1:
+            score = -self._alpha_beta(depth, -beta, -alpha, ply)
+        return score
+
+    def _poll_stop(self) -> bool:
+        """Count a node, checking the clock every TIME_CHECK_NODES nodes"""
+        self.nodes_searched += 1
+        if self.nodes_searched & (config.TIME_CHECK_NODES - 1) == 0:
+            self._apply_pending_time_manager()
+            if self.time_manager is not None and self.time_manager.hard_limit_reached():
+                self.stopped = True
+        return self.stopped
+
+    def _apply_pending_time_manager(self) -> None:
+        """Switch to a time manager handed over while searching"""
+        time_manager = self.pending_time_manager
+        if time_manager is not None:
+            self.pending_time_manager = None
+            self.time_manager = time_manager
+
+    def _static_eval(self, position: Position) -> int:
+        """
+        Static evaluation from the side to move's perspective, rounded to
+        whole centipawns so null windows (alpha, alpha + 1) stay exact
+        """
+        score = round(self.evaluator.evaluate(position))
+        return -score if position.turn == Color.BLACK else score
+
+    def _has_non_pawn_material(self, position: Position) -> bool:
+        """Check if the side to move has a piece besides pawns and king"""
+        pieces = position.pieces[position.turn]
+        return bool(
+            pieces[PieceType.KNIGHT] | pieces[PieceType.BISHOP]
+            | pieces[PieceType.ROOK] | pieces[PieceType.QUEEN]
+        )
+
+    def _quiescence_search(self, alpha: float, beta: float, ply: int) -> int:
         """Quiescence search for tactical positions"""
-        # Stand pat
-        stand_pat = self.evaluator.evaluate(position)
+        if self._poll_stop():
+            return 0
+        position = self.position
 
-        if color == Color.BLACK:
-            stand_pat = -stand_pat
+        if ply >= MAX_PLY:
+            return self._static_eval(position)
 
-        if stand_pat >= beta:
-            return beta
-        if stand_pat > alpha:
-            alpha = stand_pat
+        movegen = MoveGenerator(position)
+        checkers = movegen.checkers()
+
+        if checkers:
+            # No standing pat in check: every evasion is searched
+            moves = movegen.generate_legal_moves()
+            if not moves:
+                return -MATE_SCORE + ply
+            pinned = 0
+        else:
+            # Stand pat
+            stand_pat = self._static_eval(position)
+
+            if stand_pat >= beta:
+                return beta
+            if stand_pat > alpha:
+                alpha = stand_pat
 
-        # Generate capture moves
-        moves = self._get_capture_moves(position)
-
-        if not moves:
-            return stand_pat
+            # Pseudo-legal captures, legality checked only when searched
+            moves = self._get_capture_moves(position, movegen)
+            pinned = movegen.pinned_pieces(position.turn)
 
         for move in moves:
-            new_pos = position.copy()
-            new_pos.make_move(move)
-
-            score = -self._quiescence_search(
-                new_pos,
-                -beta,
-                -alpha,
-                color.opposite()
-            )
+            if not checkers:
+                if not movegen.is_legal(move, 0, pinned):
+                    continue
+                # Captures losing material on the exchange cannot help
+                if not see_ge(position, move):
+                    continue
+
+            position.make_move(move)
+            score = -self._quiescence_search(-beta, -alpha, ply + 1)
+            position.unmake_move()
+            if self.stopped:
+                return 0
 
             if score >= beta:
                 return beta
@@ -226,85 +500,79 @@ class Search:
 
         return alpha
 
-    def _get_ordered_moves(self, position: Optional[Position] = None) -> List[Move]:
-        """Get ordered moves with move ordering"""
+    def _get_ordered_moves(self, position: Optional[Position] = None) -> List[int]:
+        """Get all legal moves in move-picker order, hash move first"""
         if position is None:
             position = self.position
 
-        movegen = MoveGenerator(position)
-        moves = movegen.generate_legal_moves()
-
-        # Order moves: captures first, then promotions, then others
-        ordered_moves = []
-
-        # Captures
-        captures = [m for m in moves if self._is_capture(m, position)]
-        ordered_moves.extend(captures)
-
-        # Promotions
-        promotions = [m for m in moves if m.is_promotion()]
-        ordered_moves.extend(promotions)
-
-        # Other moves
-        others = [m for m in moves if not self._is_capture(m, position) and not m.is_promotion()]
-        ordered_moves.extend(others)
+        slot = self.tt.probe(position.key)
+        hash_move = self.tt.moves[slot] if slot >= 0 else MOVE_NONE
+        return list(MovePicker(position, hash_move, self.killers[0], self.history))
 
-        return ordered_moves
+    def _update_killers(self, move: int, ply: int) -> None:
+        """Remember a quiet cutoff move for this ply"""
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
 
-    def _get_capture_moves(self, position: Position) -> List[Move]:
-        """Get capture moves only"""
-        movegen = MoveGenerator(position)
-        moves = movegen.generate_legal_moves()
-
-        return [m for m in moves if self._is_capture(m, position)]
-
-    def _is_capture(self, move: Move, position: Position) -> bool:
+    def _update_quiet_stats(
+        self,
+        move: int,
+        ply: int,
+        depth: int,
+        quiets_tried: List[int],
+        counter_index: int
+    ) -> None:
+        """
+        Reward a quiet cutoff move in the killer, countermove and history
+        tables, and penalise the quiets searched before it
+        """
+        if ply < MAX_PLY:
+            self._update_killers(move, ply)
+        if counter_index >= 0:
+            self.countermoves[counter_index] = move
+
+        color = self.position.turn
+        bonus = min(depth * depth, 400)
+        update_history(self.history, butterfly_index(color, move), bonus)
+        for quiet in quiets_tried:
+            update_history(self.history, butterfly_index(color, quiet), -bonus)
+
+    def _countermove_index(self, position: Position) -> int:
+        """Countermove table index of the previous move, -1 if there is none"""
+        if not position.history or position.history[-1][0] == MOVE_NONE:
+            return -1
+        to_sq = (position.history[-1][0] >> 6) & 0x3F
+        piece = position.board[to_sq]
+        if piece is None:
+            return -1
+        return piece_to_index(piece.color, piece.piece_type, to_sq)
+
+    def _age_history(self) -> None:
+        """Halve every history score"""
+        history = self.history
+        for index in range(len(history)):
+            history[index] //= 2
+
+    def _get_capture_moves(self, position: Position, movegen: Optional[MoveGenerator] = None) -> List[int]:
+        """Get pseudo-legal captures and queen promotions, most valuable victim first"""
+        if movegen is None:
+            movegen = MoveGenerator(position)
+        board = position.board
+        return sorted(movegen.generate_noisy_moves(), key=lambda move: capture_score(board, move), reverse=True)
+
+    def _is_capture(self, move: int, position: Position) -> bool:
         """Check if move is a capture"""
-        target_piece = position.get_piece(move.to_sq)
-        return target_piece is not None
+        return position.board[(move >> 6) & 0x3F] is not None
 
     def _is_check(self, color: Color, position: Optional[Position] = None) -> bool:
         """Check if color is in check"""
         if position is None:
             position = self.position
 
-        movegen = MoveGenerator(position)
-        return movegen.is_in_check(position, color)
-
-    def _hash_position(self, position: Position) -> int:
-        """Simple hash of position"""
-        hash_val = 0
-
-        for square in position.board:
-            if square is not None:
-                hash_val ^= hash(square)
-
-        hash_val ^= hash(position.turn)
-        hash_val ^= hash(position.en_passant)
-
-        # Hash castling rights
-        for color in [Color.WHITE, Color.BLACK]:
-            hash_val ^= hash(position.castling[color].get("king", False))
-            hash_val ^= hash(position.castling[color].get("queen", False))
-
-        return hash_val
-
-    def _store_transposition(
-        self,
-        hash_key: int,
-        score: int,
-        depth: int,
-        flag: str,
-        move: Optional[Move] = None
-    ) -> None:
-        """Store position in transposition table"""
-        # Limit table size
-        if len(self.transposition_table) > config.TRANSPOSITION_TABLE_SIZE:
-            # Remove oldest entry
-            self.transposition_table.pop(next(iter(self.transposition_table)))
-
-        entry = TranspositionEntry(hash_key, score, depth, flag, move)
-        self.transposition_table[hash_key] = entry
+        king_sq = position.king_squares[color]
+        return king_sq is None or position.is_square_attacked(king_sq, color.opposite())
 
     def get_nodes_searched(self) -> int:
         """Get number of nodes searched"""
@@ -313,4 +581,7 @@ class Search:
     def reset(self) -> None:
         """Reset search state"""
         self.nodes_searched = 0
-        self.transposition_table.clear()
\ No newline at end of file
+        self.tt.clear()
+        self.killers = [[MOVE_NONE, MOVE_NONE] for _ in range(MAX_PLY)]
+        self.history = array('i', bytes(4 * 2 * 64 * 64))
+        self.countermoves = array('H', bytes(2 * 2 * 6 * 64))
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+Static exchange evaluation
+Similar to Stockfish's Position::see_ge in position.cpp
+"""
+
+from ..position import Position
+from ..bitboard import SQUARE_BB, bishop_attacks, rook_attacks
+from ..type_defs.chess_types import PieceType, MoveFlag, PROMOTION_BIT, PIECE_VALUES
+
+
+# Exchange value per piece type, indexed by PieceType
+SEE_VALUES = [PIECE_VALUES[piece_type] for piece_type in PieceType]
+
+
+def see(position: Position, move: int) -> int:
+    """
+    Material balance for the side to move of the exchange started by move
+    on its target square, each side recapturing with its least valuable
+    attacker and either side free to stop. Sliders behind a capturer join
+    in as x-rays once it has moved. Pins are ignored. The full swap list
+    is built before the negamax, without pruning, so the value is exact.
+    """
+    from_sq = move & 0x3F
+    to_sq = (move >> 6) & 0x3F
+    flag = move >> 12
+
+    if flag == MoveFlag.CASTLE_KING or flag == MoveFlag.CASTLE_QUEEN:
+        return 0
+
+    board = position.board
+    pieces = position.pieces
+    occupied = position.occupied_all ^ SQUARE_BB[from_sq]
+
+    victim = board[to_sq]
+    if flag == MoveFlag.EN_PASSANT:
+        gain = SEE_VALUES[PieceType.PAWN]
+        # The captured pawn stands behind the target square
+        occupied ^= SQUARE_BB[to_sq ^ 8]
+    else:
+        gain = SEE_VALUES[victim.piece_type] if victim is not None else 0
+
+    # Value of the piece left standing on the target square
+    on_square = SEE_VALUES[board[from_sq].piece_type]
+    if flag & PROMOTION_BIT:
+        promoted = (flag & 3) + 1
+        gain += SEE_VALUES[promoted] - SEE_VALUES[PieceType.PAWN]
+        on_square = SEE_VALUES[promoted]
+
+    diagonal = (
+        pieces[0][PieceType.BISHOP] | pieces[1][PieceType.BISHOP]
+        | pieces[0][PieceType.QUEEN] | pieces[1][PieceType.QUEEN]
+    )
+    orthogonal = (
+        pieces[0][PieceType.ROOK] | pieces[1][PieceType.ROOK]
+        | pieces[0][PieceType.QUEEN] | pieces[1][PieceType.QUEEN]
+    )
+
+    attackers = position.attackers_to(to_sq, occupied) & occupied
+    side = position.turn ^ 1
+    gains = [gain]
+
+    while True:
+        side_attackers = attackers & position.occupied[side]
+        if not side_attackers:
+            break
+
+        # Least valuable attacker
+        for piece_type in PieceType:
+            candidates = side_attackers & pieces[side][piece_type]
+            if candidates:
+                break
+
+        # A king may only recapture when nothing can take it back
+        if piece_type == PieceType.KING and attackers & position.occupied[side ^ 1]:
+            break
+
+        gains.append(on_square - gains[-1])
+
+        occupied ^= candidates & -candidates
+        if piece_type in (PieceType.PAWN, PieceType.BISHOP, PieceType.QUEEN):
+            attackers |= bishop_attacks(to_sq, occupied) & diagonal
+        if piece_type in (PieceType.ROOK, PieceType.QUEEN):
+            attackers |= rook_attacks(to_sq, occupied) & orthogonal
+        attackers &= occupied
+
+        on_square = SEE_VALUES[piece_type]
+        side ^= 1
+
+    # Negamax the swap list back to the first capture
+    for depth in range(len(gains) - 1, 0, -1):
+        gains[depth - 1] = -max(-gains[depth - 1], gains[depth])
+
+    return gains[0]
+
+
+def see_ge(position: Position, move: int, threshold: int = 0) -> bool:
+    """Check that the exchange started by move wins at least threshold"""
+    return see(position, move) >= threshold
@@ -0,0 +1,85 @@
+"""
+Time management
+Similar to Stockfish's timeman.{h,cpp}
+"""
+
+import time
+from typing import Optional
+
+import config
+
+
+class TimeManager:
+    """
+    Soft and hard time limits for one search, in seconds. The soft limit
+    is checked between iterations; for clock-based budgets it shrinks
+    while the best move stays the same. The hard limit is polled inside
+    the search and aborts it. A limit of None means no limit.
+    """
+
+    def __init__(self, soft: Optional[float] = None, hard: Optional[float] = None):
+        self.start_time = time.time()
+        self.soft = soft
+        self.hard = hard
+        self.best_move = None
+        self.stable_iterations = 0
+        # Only a budget planned from the clock may end early on a stable move
+        self.scale_with_stability = False
+
+    @classmethod
+    def from_movetime(cls, movetime: float, overhead: Optional[float] = None) -> "TimeManager":
+        """Spend a fixed time on the move"""
+        if overhead is None:
+            overhead = config.MOVE_OVERHEAD / 1000.0
+        limit = max(movetime - overhead, config.TIME_MIN)
+        return cls(limit, limit)
+
+    @classmethod
+    def from_clock(
+        cls,
+        time_left: float,
+        increment: float = 0.0,
+        moves_to_go: int = 0,
+        overhead: Optional[float] = None
+    ) -> "TimeManager":
+        """
+        Budget the remaining clock over the moves to go, counting the
+        increment for each of them and the move overhead on every move
+        """
+        if overhead is None:
+            overhead = config.MOVE_OVERHEAD / 1000.0
+        moves_to_go = min(moves_to_go or config.TIME_MOVES_TO_GO, config.TIME_MOVES_TO_GO)
+
+        available = time_left + increment * (moves_to_go - 1) - overhead * moves_to_go
+        soft = max(available / moves_to_go, config.TIME_MIN)
+        # Never plan to use more than a fixed share of the clock
+        hard = min(soft * config.TIME_HARD_FACTOR, time_left * config.TIME_MAX_SHARE - overhead)
+        hard = max(hard, config.TIME_MIN)
+        manager = cls(min(soft, hard), hard)
+        manager.scale_with_stability = True
+        return manager
+
+    def elapsed(self) -> float:
+        """Seconds since the search started"""
+        return time.time() - self.start_time
+
+    def record_iteration(self, best_move: int) -> None:
+        """Track how many iterations in a row returned the same best move"""
+        if best_move == self.best_move:
+            self.stable_iterations += 1
+        else:
+            self.best_move = best_move
+            self.stable_iterations = 0
+
+    def soft_limit_reached(self) -> bool:
+        """Check if there is no time for another iteration"""
+        if self.soft is None:
+            return False
+        scale = 1.0
+        if self.scale_with_stability:
+            scale = max(config.TIME_STABLE_MIN_SCALE, 1.0 - config.TIME_STABLE_STEP * self.stable_iterations)
+        return self.elapsed() > self.soft * scale
+
+    def hard_limit_reached(self) -> bool:
+        """Check if the search must stop now"""
+        return self.hard is not None and self.elapsed() > self.hard
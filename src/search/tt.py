@@ -0,0 +1,141 @@
+"""
+Transposition table
+Similar to Stockfish's tt.{h,cpp}
+"""
+
+from array import array
+
+from ..type_defs.chess_types import MOVE_NONE
+import config
+
+
+# Bound types, stored in the low two bits of an entry's generation byte
+BOUND_NONE = 0
+BOUND_UPPER = 1
+BOUND_LOWER = 2
+BOUND_EXACT = BOUND_UPPER | BOUND_LOWER
+
+# Entries per bucket; a key may live in any slot of its bucket
+CLUSTER_SIZE = 3
+
+# Bytes per entry: key (8), score (4), move (2), depth (1), generation/bound (1)
+ENTRY_SIZE = 16
+
+# The generation takes the upper six bits of the generation byte
+GENERATION_DELTA = 1 << 2
+GENERATION_CYCLE = 0xFF + GENERATION_DELTA
+GENERATION_MASK = 0xFC
+
+KEY_MASK = (1 << 64) - 1
+
+
+class TranspositionTable:
+    """
+    Fixed-size transposition table of bucketed entries, stored in parallel
+    arrays and addressed by index. A probe returns a slot index into the
+    arrays, or -1 on a miss.
+    """
+
+    def __init__(self, size_mb: int = config.UCI_HASH):
+        self.generation = 0
+        self.resize(size_mb)
+
+    def resize(self, size_mb: int) -> None:
+        """Reallocate the table to size_mb megabytes, clearing it"""
+        self.size_mb = size_mb
+        self.cluster_count = max(1, (size_mb * 1024 * 1024) // (ENTRY_SIZE * CLUSTER_SIZE))
+        size = self.cluster_count * CLUSTER_SIZE
+        self.keys = array('Q', bytes(8 * size))
+        self.scores = array('i', bytes(4 * size))
+        self.moves = array('H', bytes(2 * size))
+        self.depths = array('b', bytes(size))
+        self.generations = array('B', bytes(size))
+
+    def clear(self) -> None:
+        """Empty every entry"""
+        self.resize(self.size_mb)
+        self.generation = 0
+
+    def new_search(self) -> None:
+        """Age the table so entries of earlier searches are replaced first"""
+        self.generation = (self.generation + GENERATION_DELTA) & GENERATION_MASK
+
+    def _first_slot(self, key: int) -> int:
+        """First slot of the bucket for key"""
+        return ((key & KEY_MASK) * self.cluster_count >> 64) * CLUSTER_SIZE
+
+    def probe(self, key: int) -> int:
+        """Get the slot holding key, -1 if it is not stored"""
+        key &= KEY_MASK
+        first = self._first_slot(key)
+        keys = self.keys
+        generations = self.generations
+        for slot in range(first, first + CLUSTER_SIZE):
+            if keys[slot] == key and generations[slot] & BOUND_EXACT:
+                # Refresh the age so the entry survives this search
+                generations[slot] = self.generation | (generations[slot] & BOUND_EXACT)
+                return slot
+        return -1
+
+    def bound(self, slot: int) -> int:
+        """Bound type of the entry in slot"""
+        return self.generations[slot] & BOUND_EXACT
+
+    def store(
+        self,
+        key: int,
+        score: int,
+        depth: int,
+        bound: int,
+        move: int = MOVE_NONE
+    ) -> None:
+        """
+        Store an entry, replacing the same key in the bucket if present,
+        otherwise the shallowest and oldest entry
+        """
+        key &= KEY_MASK
+        first = self._first_slot(key)
+        keys = self.keys
+        depths = self.depths
+        generations = self.generations
+        generation = self.generation
+
+        replace = first
+        replace_value = None
+        for slot in range(first, first + CLUSTER_SIZE):
+            if keys[slot] == key or not generations[slot] & BOUND_EXACT:
+                replace = slot
+                break
+            # Prefer deep entries from the current search
+            age = (GENERATION_CYCLE + generation - generations[slot]) & GENERATION_MASK
+            value = depths[slot] - 2 * age
+            if replace_value is None or value < replace_value:
+                replace = slot
+                replace_value = value
+
+        # Keep a deeper entry for the same key unless the new one is exact
+        if (keys[replace] == key and generations[replace] & BOUND_EXACT
+                and bound != BOUND_EXACT and depth + 4 <= depths[replace]
+                and generations[replace] & GENERATION_MASK == generation):
+            return
+
+        if move == MOVE_NONE and keys[replace] == key:
+            # Keep the old move rather than losing it
+            move = self.moves[replace]
+
+        keys[replace] = key
+        self.scores[replace] = score
+        self.moves[replace] = move
+        depths[replace] = max(-128, min(127, depth))
+        generations[replace] = generation | bound
+
+    def hashfull(self) -> int:
+        """Permille of sampled entries written during the current search"""
+        generations = self.generations
+        generation = self.generation
+        sample = min(1000, self.cluster_count) * CLUSTER_SIZE
+        used = 0
+        for slot in range(sample):
+            if generations[slot] & BOUND_EXACT and generations[slot] & GENERATION_MASK == generation:
+                used += 1
+        return used * 1000 // sample
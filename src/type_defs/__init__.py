@@ -2,7 +2,25 @@
 Type definitions for chess bot
 """
 
-from .chess_types import Color, PieceType, Piece, Square, Move, MoveFlag
+from .chess_types import (
+    Color,
+    PieceType,
+    Piece,
+    Square,
+    Move,
+    MoveFlag,
+    WHITE_OO,
+    WHITE_OOO,
+    BLACK_OO,
+    BLACK_OOO,
+    MOVE_NONE,
+    encode_move,
+    move_from,
+    move_to,
+    move_flag,
+    move_promotion,
+    move_to_uci,
+)
 
 __all__ = [
     "Color",
@@ -11,4 +29,15 @@ __all__ = [
     "Square",
     "Move",
     "MoveFlag",
+    "WHITE_OO",
+    "WHITE_OOO",
+    "BLACK_OO",
+    "BLACK_OOO",
+    "MOVE_NONE",
+    "encode_move",
+    "move_from",
+    "move_to",
+    "move_flag",
+    "move_promotion",
+    "move_to_uci",
 ]
\ No newline at end of file
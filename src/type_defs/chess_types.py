@@ -164,42 +164,117 @@ class MoveFlag(IntEnum):
     PROMOTION = 5
 
 
-class Move:
-    """Chess move"""
+# Castling rights bitmask
+WHITE_OO = 1
+WHITE_OOO = 2
+BLACK_OO = 4
+BLACK_OOO = 8
+ALL_CASTLING = WHITE_OO | WHITE_OOO | BLACK_OO | BLACK_OOO
 
-    def __init__(
-        self,
+# Rights indexed by color
+KINGSIDE_CASTLING = [WHITE_OO, BLACK_OO]
+QUEENSIDE_CASTLING = [WHITE_OOO, BLACK_OOO]
+
+
+# Packed 16-bit move layout:
+#   bits 0-5    from square
+#   bits 6-11   to square
+#   bits 12-15  MoveFlag, or PROMOTION_BIT | (piece_type - 1) for promotions
+# Search and move generation pass moves around as plain ints in this format.
+MOVE_NONE = 0
+PROMOTION_BIT = 8
+
+PROMOTION_CHARS = "nbrq"
+
+
+def encode_move(
+    from_sq: int,
+    to_sq: int,
+    flag: MoveFlag = MoveFlag.NORMAL,
+    promotion: Optional[PieceType] = None
+) -> int:
+    """Pack a move into 16 bits"""
+    if promotion is not None:
+        return from_sq | to_sq << 6 | (PROMOTION_BIT | (promotion - 1)) << 12
+    return from_sq | to_sq << 6 | flag << 12
+
+
+def move_from(move: int) -> int:
+    """Get from square of a packed move"""
+    return move & 0x3F
+
+
+def move_to(move: int) -> int:
+    """Get to square of a packed move"""
+    return (move >> 6) & 0x3F
+
+
+def move_flag(move: int) -> MoveFlag:
+    """Get flag of a packed move"""
+    flag = move >> 12
+    return MoveFlag.PROMOTION if flag & PROMOTION_BIT else MoveFlag(flag)
+
+
+def move_promotion(move: int) -> Optional[PieceType]:
+    """Get promotion piece type of a packed move"""
+    flag = move >> 12
+    return PieceType((flag & 3) + 1) if flag & PROMOTION_BIT else None
+
+
+def move_to_uci(move: int) -> str:
+    """Convert a packed move to UCI notation (e.g., 'e7e8q')"""
+    move_str = f"{Square(move & 0x3F)}{Square((move >> 6) & 0x3F)}"
+    flag = move >> 12
+    if flag & PROMOTION_BIT:
+        move_str += PROMOTION_CHARS[flag & 3]
+    return move_str
+
+
+class Move(int):
+    """
+    Chess move as a packed 16-bit int with readable accessors.
+    Only built at API boundaries; it compares and hashes like the plain int.
+    """
+
+    __slots__ = ()
+
+    def __new__(
+        cls,
         from_sq: Square,
         to_sq: Square,
         flag: MoveFlag = MoveFlag.NORMAL,
         promotion: Optional[PieceType] = None
-    ):
-        self.from_sq = from_sq
-        self.to_sq = to_sq
-        self.flag = flag
-        self.promotion = promotion
+    ) -> "Move":
+        if promotion is not None:
+            flag = MoveFlag.PROMOTION
+        return super().__new__(cls, encode_move(from_sq, to_sq, flag, promotion))
 
-    def __eq__(self, other) -> bool:
-        if not isinstance(other, Move):
-            return False
-        return (
-            self.from_sq == other.from_sq and
-            self.to_sq == other.to_sq and
-            self.flag == other.flag and
-            self.promotion == other.promotion
-        )
+    @classmethod
+    def from_int(cls, move: int) -> "Move":
+        """Wrap a packed move"""
+        return int.__new__(cls, move)
 
-    def __hash__(self) -> int:
-        return hash((self.from_sq, self.to_sq, self.flag, self.promotion))
+    @property
+    def from_sq(self) -> Square:
+        return Square(move_from(self))
+
+    @property
+    def to_sq(self) -> Square:
+        return Square(move_to(self))
+
+    @property
+    def flag(self) -> MoveFlag:
+        return move_flag(self)
+
+    @property
+    def promotion(self) -> Optional[PieceType]:
+        return move_promotion(self)
 
     def __repr__(self) -> str:
         return f"Move({self.from_sq}{self.to_sq}, flag={self.flag}, promo={self.promotion})"
 
     def __str__(self) -> str:
-        move_str = f"{self.from_sq}{self.to_sq}"
-        if self.promotion:
-            move_str += str(self.promotion).lower()
-        return move_str
+        return move_to_uci(self)
 
     def is_capture(self) -> bool:
         """Check if move is a capture"""
@@ -4,13 +4,16 @@ Similar to Stockfish's uci.{h,cpp}
 """
 
 import sys
+import threading
 import time
 import requests
 from typing import Optional, Dict
 
 from ..position import Position
-from ..type_defs.chess_types import Color, Square, Move, MoveFlag
-from ..search import Search
+from ..type_defs.chess_types import Color, Move, move_to_uci
+from ..movegen import MoveGenerator
+from ..search import Search, TimeManager, TranspositionTable, MAX_PLY, MATE_SCORE, MATE_IN_MAX_PLY
+from ..perft import print_divide
 import config
 
 
@@ -20,6 +23,15 @@ class UCIEngine:
     def __init__(self):
         self.position = Position()
         self.search = None
+        self._search_start = 0.0
+        # Worker thread of the running search, if any
+        self._search_thread: Optional[threading.Thread] = None
+        # Cleared during go infinite / go ponder: bestmove waits until set
+        self._release = threading.Event()
+        # Time limits to switch to on ponderhit
+        self._ponder_time_manager: Optional[TimeManager] = None
+        # Kept across searches and resized by the Hash option
+        self.tt = TranspositionTable(config.UCI_HASH)
         self.running = True
         self.debug = config.DEBUG_MODE
 
@@ -27,8 +39,14 @@ class UCIEngine:
         """Run UCI engine loop"""
         while self.running:
             try:
-                line = sys.stdin.readline().strip()
+                line = sys.stdin.readline()
 
+                # End of input
+                if not line:
+                    self.quit_cmd()
+                    break
+
+                line = line.strip()
                 if not line:
                     continue
 
@@ -57,6 +75,8 @@ class UCIEngine:
             self.go_cmd(parts[1:])
         elif cmd == "stop":
             self.stop_cmd()
+        elif cmd == "ponderhit":
+            self.ponderhit_cmd()
         elif cmd == "quit":
             self.quit_cmd()
         elif cmd == "debug":
@@ -71,25 +91,31 @@ class UCIEngine:
         """Handle uci command"""
         print("id name ChessBot 1.0")
         print("id author YuHNoaD")
-        print("option name Hash type spin default 128 min 1 max 1024")
+        print(f"option name Hash type spin default {config.UCI_HASH} min 1 max 1024")
+        print(f"option name Move Overhead type spin default {config.MOVE_OVERHEAD} min 0 max 5000")
         print("option name Threads type spin default 4 min 1 max 16")
         print("option name Skill Level type spin default 10 min 0 max 20")
         print("uciok")
 
     def isready(self) -> None:
-        """Handle isready command"""
-        print("readyok")
+        """Handle isready command, answered at once even while searching"""
+        print("readyok", flush=True)
 
     def ucinewgame(self) -> None:
         """Handle ucinewgame command"""
+        self.stop_cmd()
         self.position = Position()
         self.search = None
+        self.tt.clear()
 
     def position_cmd(self, args: list) -> None:
         """Handle position command"""
         if not args:
             return
 
+        # The search works on self.position in place
+        self.stop_cmd()
+
         if args[0] == "startpos":
             self.position = Position()
             args = args[1:]
@@ -107,55 +133,117 @@ class UCIEngine:
 
     def go_cmd(self, args: list) -> None:
         """Handle go command"""
-        # Parse arguments
-        depth = config.SEARCH_DEPTH
-        time_limit = config.SEARCH_TIME
+        # The search and perft both work on self.position in place
+        self.stop_cmd()
 
+        if args and args[0] == "perft":
+            if len(args) > 1:
+                print_divide(self.position, int(args[1]), config.PERFT_HASH, config.UCI_THREADS)
+            return
+
+        # Parse arguments: integer values by name, times in milliseconds
+        limits = {}
+        infinite = ponder = False
         i = 0
         while i < len(args):
-            if args[i] == "depth":
-                if i + 1 < len(args):
-                    depth = int(args[i + 1])
-                    i += 2
-            elif args[i] == "movetime":
+            if args[i] in ("depth", "movetime", "wtime", "btime", "winc", "binc", "movestogo"):
                 if i + 1 < len(args):
-                    time_limit = int(args[i + 1]) / 1000.0
-                    i += 2
-            elif args[i] == "wtime":
+                    limits[args[i]] = int(args[i + 1])
                 i += 2
-            elif args[i] == "btime":
-                i += 2
-            elif args[i] == "winc":
-                i += 2
-            elif args[i] == "binc":
-                i += 2
-            elif args[i] == "movestogo":
-                i += 2
-            elif args[i] == "infinite":
-                i += 1
             else:
+                infinite = infinite or args[i] == "infinite"
+                ponder = ponder or args[i] == "ponder"
                 i += 1
 
-        # Find best move
-        self.search = Search(self.position)
-        best_move = self.search.find_best_move(depth, time_limit)
-
-        if best_move:
-            print(f"bestmove {best_move}")
+        depth = limits.get("depth", config.SEARCH_DEPTH)
+        if self.position.turn == Color.WHITE:
+            clock, increment = limits.get("wtime"), limits.get("winc", 0)
+        else:
+            clock, increment = limits.get("btime"), limits.get("binc", 0)
+
+        if "movetime" in limits:
+            time_manager = TimeManager.from_movetime(limits["movetime"] / 1000.0)
+        elif clock is not None:
+            time_manager = TimeManager.from_clock(
+                clock / 1000.0, increment / 1000.0, limits.get("movestogo", 0)
+            )
+            # The clock decides when to stop, not the default depth
+            if "depth" not in limits:
+                depth = MAX_PLY - 1
+        elif "depth" in limits:
+            time_manager = TimeManager()
+        else:
+            time_manager = TimeManager.from_movetime(config.SEARCH_TIME, 0.0)
+
+        # Search until stop, or until ponderhit brings in the clock
+        self._ponder_time_manager = None
+        if infinite or ponder:
+            if ponder:
+                self._ponder_time_manager = time_manager
+            if "depth" not in limits:
+                depth = MAX_PLY - 1
+            time_manager = TimeManager()
+            self._release.clear()
         else:
-            # No legal moves
-            if self.search._is_check(self.position.turn):
-                print("bestmove (none)")
+            self._release.set()
+
+        # Search on a worker thread so commands keep being read
+        self.search = Search(self.position, self.tt)
+        self.search.info_callback = self._print_info
+        self._search_start = time.time()
+        self._search_thread = threading.Thread(
+            target=self._search_worker, args=(self.search, depth, time_manager), daemon=True
+        )
+        self._search_thread.start()
+
+    def _search_worker(self, search: Search, depth: int, time_manager: TimeManager) -> None:
+        """Run a search and report its best move once released"""
+        best_move = None
+        try:
+            best_move = search.find_best_move(depth, time_manager=time_manager)
+        finally:
+            # In go infinite / go ponder, bestmove waits for stop or ponderhit.
+            # It is sent even if the search failed, so the GUI never hangs.
+            self._release.wait()
+
+            if best_move:
+                print(f"bestmove {best_move}", flush=True)
             else:
-                print("bestmove (none)")  # Stalemate
+                # No legal moves: checkmate or stalemate
+                print("bestmove (none)", flush=True)
+
+    def wait(self) -> None:
+        """Block until the running search has reported its best move"""
+        if self._search_thread is not None:
+            self._search_thread.join()
+            self._search_thread = None
 
     def stop_cmd(self) -> None:
-        """Handle stop command"""
-        # Stop search (not implemented for simplicity)
-        pass
+        """Handle stop command: end the search and report bestmove at once"""
+        thread = self._search_thread
+        if thread is None:
+            return
+        self._release.set()
+        # Keep raising the flag: a search just starting clears it once
+        while thread.is_alive():
+            self.search.stopped = True
+            thread.join(0.01)
+        self._search_thread = None
+
+    def ponderhit_cmd(self) -> None:
+        """Handle ponderhit command: the pondered move was played"""
+        time_manager = self._ponder_time_manager
+        self._ponder_time_manager = None
+        if self.search is not None and time_manager is not None:
+            # The clock starts now. Handed over through a separate field so
+            # a search that is still starting up cannot overwrite it.
+            time_manager.start_time = time.time()
+            self.search.pending_time_manager = time_manager
+        self._release.set()
 
     def quit_cmd(self) -> None:
         """Handle quit command"""
+        self.stop_cmd()
         self.running = False
 
     def debug_cmd(self, args: list) -> None:
@@ -170,6 +258,9 @@ class UCIEngine:
         if not args:
             return
 
+        # Options such as Hash must not change under a running search
+        self.stop_cmd()
+
         if args[0] == "name":
             i = 1
             while i < len(args) and args[i] != "value":
@@ -181,44 +272,42 @@ class UCIEngine:
 
                 # Set option
                 if option_name == "Hash":
-                    config.TRANSPOSITION_TABLE_SIZE = int(option_value) * 1024
+                    config.UCI_HASH = int(option_value)
+                    self.tt.resize(config.UCI_HASH)
+                elif option_name == "Move Overhead":
+                    config.MOVE_OVERHEAD = int(option_value)
                 elif option_name == "Threads":
                     config.UCI_THREADS = int(option_value)
                 elif option_name == "Skill Level":
                     config.UCI_SKILL_LEVEL = int(option_value)
 
+    def _print_info(self, depth: int, score: float, move: int) -> None:
+        """Print an info line for a completed iteration"""
+        elapsed = max(time.time() - self._search_start, 0.001)
+        nodes = self.search.nodes_searched
+        if abs(score) >= MATE_IN_MAX_PLY:
+            # Mate in moves, negative when we are being mated
+            plies = MATE_SCORE - abs(score)
+            moves = (plies + 1) // 2 if score > 0 else -(plies // 2)
+            score_str = f"mate {int(moves)}"
+        else:
+            score_str = f"cp {int(score)}"
+        print(
+            f"info depth {depth} score {score_str} nodes {nodes} "
+            f"nps {int(nodes / elapsed)} time {int(elapsed * 1000)} "
+            f"hashfull {self.tt.hashfull()} pv {move_to_uci(move)}"
+        )
+        sys.stdout.flush()
+
     def _parse_move(self, move_str: str) -> Optional[Move]:
-        """Parse move string to Move object"""
-        if len(move_str) < 4:
-            return None
-
-        from_sq = Square.from_string(move_str[0:2])
-        to_sq = Square.from_string(move_str[2:4])
-
-        flag = MoveFlag.NORMAL
-        promotion = None
-
-        if len(move_str) > 4:
-            promo_char = move_str[4].lower()
-            promo_map = {
-                'q': MoveFlag.PROMOTION,
-                'r': MoveFlag.PROMOTION,
-                'b': MoveFlag.PROMOTION,
-                'n': MoveFlag.PROMOTION,
-            }
-            flag = promo_map.get(promo_char, MoveFlag.NORMAL)
-
-            if flag == MoveFlag.PROMOTION:
-                from ..types import PieceType
-                piece_map = {
-                    'q': PieceType.QUEEN,
-                    'r': PieceType.ROOK,
-                    'b': PieceType.BISHOP,
-                    'n': PieceType.KNIGHT,
-                }
-                promotion = piece_map.get(promo_char)
-
-        return Move(from_sq, to_sq, flag, promotion)
+        """Parse UCI move string to a legal move of the current position"""
+        move_str = move_str.lower()
+
+        for move in MoveGenerator(self.position).generate_legal_moves():
+            if move_to_uci(move) == move_str:
+                return Move.from_int(move)
+
+        return None
 
     def connect_to_chesscom(
         self,
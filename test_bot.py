@@ -12,7 +12,7 @@ from src.position import Position
 from src.movegen import MoveGenerator
 from src.search import Search
 from src.evaluation import Evaluator
-from src.type_defs.chess_types import Square, Color, Move, MoveFlag
+from src.type_defs.chess_types import Square, Color, Move, MoveFlag, move_to_uci
 
 def test_basic():
     """Test basic functionality"""
@@ -33,7 +33,7 @@ def test_basic():
     print(f"[OK] Generated {len(moves)} legal moves")
 
     # Print first 5 moves
-    print(f"First 5 moves: {[str(m) for m in moves[:5]]}")
+    print(f"First 5 moves: {[move_to_uci(m) for m in moves[:5]]}")
 
     # Test 3: Evaluate position
     print("\n[Test 3] Evaluating position...")
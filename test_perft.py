@@ -0,0 +1,45 @@
+"""
+Perft test script for ChessBot
+"""
+
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.position import Position
+from src.perft import PERFT_SUITE, PerftTable, perft, divide, run_suite
+
+def test_perft():
+    """Test move generation against reference perft counts"""
+    print("=" * 60)
+    print("Testing ChessBot - Perft")
+    print("=" * 60)
+
+    # Test 1: Reference suite
+    print("\n[Test 1] Running perft suite...")
+    assert run_suite(max_nodes=100000)
+    print("[OK] All positions match")
+
+    # Test 2: Divide sums to perft
+    print("\n[Test 2] Checking divide against perft...")
+    name, fen, expected_counts = PERFT_SUITE[1]
+    pos = Position(fen)
+    results = divide(pos, 3)
+    assert sum(count for _, count in results) == expected_counts[2]
+    assert pos.to_fen() == fen
+    print(f"[OK] {name}: {len(results)} root moves, {expected_counts[2]} nodes")
+
+    # Test 3: Hashed perft
+    print("\n[Test 3] Checking hashed perft...")
+    name, fen, expected_counts = PERFT_SUITE[0]
+    assert perft(Position(fen), 4, PerftTable(1)) == expected_counts[3]
+    print(f"[OK] {name}: {expected_counts[3]} nodes")
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_perft()
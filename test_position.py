@@ -0,0 +1,90 @@
+"""
+Position test script for ChessBot
+"""
+
+import sys
+import os
+import random
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.position import Position
+from src.movegen import MoveGenerator
+from src.perft import PERFT_SUITE
+
+def walk(pos, depth):
+    """Make and unmake every move to depth, checking the key at each node"""
+    assert pos.key == pos.compute_key()
+    if depth == 0:
+        return 1
+    fen = pos.to_fen()
+    key = pos.key
+    nodes = 0
+    for move in MoveGenerator(pos).generate_legal_moves():
+        pos.make_move(move)
+        nodes += walk(pos, depth - 1)
+        pos.unmake_move()
+        assert pos.key == key and pos.to_fen() == fen
+    return nodes
+
+def test_position():
+    """Test the incremental key and make/unmake"""
+    print("=" * 60)
+    print("Testing ChessBot - Position")
+    print("=" * 60)
+
+    # Test 1: Incremental key after make and unmake
+    print("\n[Test 1] Walking the perft suite...")
+    for name, fen, _ in PERFT_SUITE:
+        nodes = walk(Position(fen), 2)
+        print(f"[OK] {name}: {nodes} nodes")
+
+    # Test 2: Null moves flip the side and clear en passant
+    print("\n[Test 2] Making null moves...")
+    for fen in [
+        "rnbqkbnr/ppp1pppp/8/3pP3/8/8/PPPP1PPP/RNBQKBNR w KQkq d6 0 3",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    ]:
+        pos = Position(fen)
+        key = pos.key
+        pos.make_null_move()
+        assert pos.key == pos.compute_key() and pos.key != key
+        pos.unmake_null_move()
+        assert pos.key == key and pos.to_fen() == fen
+    print("[OK] Null move keys match")
+
+    # Test 3: Random games unwind to the start
+    print("\n[Test 3] Unwinding random games...")
+    rng = random.Random(2024)
+    for name, fen, _ in PERFT_SUITE:
+        for _ in range(10):
+            pos = Position(fen)
+            key = pos.key
+            made = []
+            for _ in range(60):
+                gen = MoveGenerator(pos)
+                moves = gen.generate_legal_moves()
+                if not moves:
+                    break
+                if not gen.checkers() and rng.random() < 0.1:
+                    pos.make_null_move()
+                    made.append(None)
+                else:
+                    pos.make_move(rng.choice(moves))
+                    made.append(True)
+                assert pos.key == pos.compute_key()
+            for kind in reversed(made):
+                if kind is None:
+                    pos.unmake_null_move()
+                else:
+                    pos.unmake_move()
+            assert pos.key == key and pos.to_fen() == fen
+        print(f"[OK] {name}")
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_position()
@@ -0,0 +1,57 @@
+"""
+Static exchange evaluation test script for ChessBot
+"""
+
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.position import Position
+from src.movegen import MoveGenerator
+from src.search import see, see_ge
+from src.type_defs.chess_types import move_to_uci
+
+# (FEN, move, expected SEE with P=100, N=320, B=330, R=500, Q=900)
+SEE_POSITIONS = [
+    # Rook takes an undefended pawn
+    ("1k1r4/1pp4p/p7/4p3/8/P5P1/1PP4P/2K1R3 w - - 0 1", "e1e5", 100),
+    # Knight takes a defended pawn, many pieces behind on both sides
+    ("1k1r3q/1ppn3p/p4b2/4p3/8/P2N2P1/1PP1R1BP/2K1Q3 w - - 0 1", "d3e5", -220),
+    # Pawn takes a knight, pawn recaptures
+    ("r1bqk1nr/2ppppbp/p1n5/1P4p1/6P1/PQ5N/RP1PPP1P/1NB1KB1R w Kkq - 3 8", "b5c6", 220),
+    # Doubled rooks on the file: x-ray wins the pawn
+    ("3rk3/8/8/3p4/8/8/3R4/3RK3 w - - 0 1", "d2d5", 100),
+    # Rook lost to a doubled rook battery
+    ("3rk3/3r4/8/3p4/8/8/3R4/3QK3 w - - 0 1", "d2d5", -400),
+]
+
+def find_move(pos, uci):
+    for move in MoveGenerator(pos).generate_legal_moves():
+        if move_to_uci(move) == uci:
+            return move
+    return None
+
+def test_see():
+    """Test SEE against known exchanges"""
+    print("=" * 60)
+    print("Testing ChessBot - Static Exchange Evaluation")
+    print("=" * 60)
+
+    for fen, uci, expected in SEE_POSITIONS:
+        print(f"\n[Test] {uci} in {fen[:40]}...")
+        pos = Position(fen)
+        move = find_move(pos, uci)
+        assert move is not None
+        value = see(pos, move)
+        assert value == expected, f"{uci}: got {value}, expected {expected}"
+        assert see_ge(pos, move, expected) and not see_ge(pos, move, expected + 1)
+        print(f"[OK] SEE = {value}")
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_see()
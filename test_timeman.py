@@ -0,0 +1,113 @@
+"""
+Time management test script for ChessBot
+"""
+
+import sys
+import os
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import config
+from src.search import TimeManager
+
+OVERHEAD = 0.05
+
+def close(a, b):
+    return abs(a - b) < 1e-9
+
+def spend(manager, seconds):
+    """Pretend the search has been running for seconds"""
+    manager.start_time = time.time() - seconds
+
+def test_timeman():
+    """Test soft and hard limits of the time manager"""
+    print("=" * 60)
+    print("Testing ChessBot - Time Manager")
+    print("=" * 60)
+
+    # Test 1: Clock without movestogo or increment
+    print("\n[Test 1] Budgeting a bare clock...")
+    tm = TimeManager.from_clock(60.0, overhead=OVERHEAD)
+    mtg = config.TIME_MOVES_TO_GO
+    soft = (60.0 - OVERHEAD * mtg) / mtg
+    assert close(tm.soft, soft)
+    assert close(tm.hard, min(soft * config.TIME_HARD_FACTOR, 60.0 * config.TIME_MAX_SHARE - OVERHEAD))
+    print(f"[OK] soft {tm.soft:.3f}s, hard {tm.hard:.3f}s")
+
+    # Test 2: Clock with movestogo and increment
+    print("\n[Test 2] Budgeting movestogo and increment...")
+    tm = TimeManager.from_clock(60.0, 1.0, 10, OVERHEAD)
+    soft = (60.0 + 1.0 * 9 - OVERHEAD * 10) / 10
+    assert close(tm.soft, soft)
+    assert close(tm.hard, soft * config.TIME_HARD_FACTOR)
+    # More moves to go than the default horizon are clamped to it
+    far = TimeManager.from_clock(60.0, 0.0, mtg + 10, OVERHEAD)
+    assert close(far.soft, TimeManager.from_clock(60.0, 0.0, mtg, OVERHEAD).soft)
+    print(f"[OK] soft {tm.soft:.3f}s, hard {tm.hard:.3f}s")
+
+    # Test 3: The hard limit never exceeds the clock share
+    print("\n[Test 3] Capping the hard limit by the clock...")
+    tm = TimeManager.from_clock(2.0, 5.0, 1, OVERHEAD)
+    assert close(tm.hard, 2.0 * config.TIME_MAX_SHARE - OVERHEAD)
+    assert tm.soft <= tm.hard
+    print(f"[OK] soft {tm.soft:.3f}s, hard {tm.hard:.3f}s")
+
+    # Test 4: Overhead larger than the clock clamps to TIME_MIN
+    print("\n[Test 4] Clamping to the minimum time...")
+    tm = TimeManager.from_clock(0.03, overhead=OVERHEAD)
+    assert tm.soft == config.TIME_MIN and tm.hard == config.TIME_MIN
+    tm = TimeManager.from_movetime(0.02, OVERHEAD)
+    assert tm.soft == config.TIME_MIN and tm.hard == config.TIME_MIN
+    print(f"[OK] Limits clamped to {config.TIME_MIN}s")
+
+    # Test 5: Movetime spends the full time
+    print("\n[Test 5] Spending a fixed movetime...")
+    tm = TimeManager.from_movetime(1.0, OVERHEAD)
+    assert close(tm.soft, 1.0 - OVERHEAD) and close(tm.hard, 1.0 - OVERHEAD)
+    for _ in range(5):
+        tm.record_iteration(1)
+    spend(tm, 0.9)
+    assert not tm.soft_limit_reached()
+    assert not tm.hard_limit_reached()
+    spend(tm, 1.0)
+    assert tm.soft_limit_reached()
+    assert tm.hard_limit_reached()
+    print("[OK] Stable best move does not cut movetime short")
+
+    # Test 6: A stable best move shrinks a clock budget
+    print("\n[Test 6] Shrinking the soft limit on a stable best move...")
+    tm = TimeManager.from_clock(60.0, overhead=OVERHEAD)
+    spend(tm, tm.soft * 0.8)
+    tm.record_iteration(1)
+    assert not tm.soft_limit_reached()
+    tm.record_iteration(1)
+    tm.record_iteration(1)
+    assert tm.stable_iterations == 2
+    assert tm.soft_limit_reached()
+    # A new best move resets the count
+    tm.record_iteration(2)
+    assert tm.stable_iterations == 0
+    assert not tm.soft_limit_reached()
+    assert not tm.hard_limit_reached()
+    print("[OK] Soft limit scales with stability")
+
+    # Test 7: Fixed and missing limits
+    print("\n[Test 7] Checking fixed and missing limits...")
+    tm = TimeManager(1.0, 1.0)
+    for _ in range(5):
+        tm.record_iteration(1)
+    spend(tm, 0.9)
+    assert not tm.soft_limit_reached()
+    tm = TimeManager()
+    spend(tm, 1e6)
+    assert not tm.soft_limit_reached() and not tm.hard_limit_reached()
+    print("[OK] Fixed limits use the full time, no limits never stop")
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_timeman()
@@ -0,0 +1,115 @@
+"""
+Transposition table test script for ChessBot
+"""
+
+import sys
+import os
+import random
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.search import MATE_SCORE, TranspositionTable
+from src.search.search import score_to_tt, score_from_tt
+from src.search.tt import BOUND_UPPER, BOUND_LOWER, BOUND_EXACT, CLUSTER_SIZE
+
+def bucket_key(tt, bucket, offset=0):
+    """Smallest key addressing bucket, plus offset"""
+    key = -(-(bucket << 64) // tt.cluster_count) + offset
+    assert tt._first_slot(key) == bucket * CLUSTER_SIZE
+    return key
+
+def test_tt():
+    """Test the transposition table"""
+    print("=" * 60)
+    print("Testing ChessBot - Transposition Table")
+    print("=" * 60)
+
+    tt = TranspositionTable(1)
+    rng = random.Random(2024)
+    bucket = rng.randrange(tt.cluster_count)
+    keys = [bucket_key(tt, bucket, offset) for offset in range(5)]
+
+    # Test 1: Store and probe
+    print("\n[Test 1] Storing and probing...")
+    tt.store(keys[0], -37, 6, BOUND_EXACT, 1234)
+    slot = tt.probe(keys[0])
+    assert slot >= 0
+    assert tt.scores[slot] == -37 and tt.depths[slot] == 6
+    assert tt.moves[slot] == 1234 and tt.bound(slot) == BOUND_EXACT
+    # Another key in the same bucket is a miss
+    assert tt.probe(keys[1]) == -1
+    print(f"[OK] Hit in slot {slot}, miss on a different key")
+
+    # Test 2: Same key updates
+    print("\n[Test 2] Updating the same key...")
+    tt.store(keys[0], 50, 12, BOUND_LOWER, 99)
+    tt.store(keys[0], 10, 3, BOUND_UPPER)
+    slot = tt.probe(keys[0])
+    assert tt.depths[slot] == 12 and tt.scores[slot] == 50
+    tt.store(keys[0], 20, 3, BOUND_EXACT)
+    assert tt.probe(keys[0]) == slot
+    assert tt.depths[slot] == 3 and tt.scores[slot] == 20
+    # The old move survives a store without one
+    assert tt.moves[slot] == 99
+    print("[OK] Deep bounds kept, exact scores replace, move kept")
+
+    # Test 3: A full bucket replaces the shallowest entry
+    print("\n[Test 3] Replacing within a bucket...")
+    tt.clear()
+    for key, depth in zip(keys[:3], [5, 2, 8]):
+        tt.store(key, 0, depth, BOUND_EXACT)
+    tt.store(keys[3], 0, 4, BOUND_EXACT)
+    assert tt.probe(keys[1]) == -1
+    assert all(tt.probe(key) >= 0 for key in [keys[0], keys[2], keys[3]])
+    print("[OK] Shallowest entry replaced")
+
+    # Test 4: Entries of older searches are replaced first
+    print("\n[Test 4] Replacing across generations...")
+    tt.clear()
+    tt.store(keys[0], 0, 10, BOUND_EXACT)
+    tt.store(keys[1], 0, 9, BOUND_EXACT)
+    tt.new_search()
+    # Probing refreshes the age of keys[1]
+    assert tt.probe(keys[1]) >= 0
+    tt.store(keys[2], 0, 3, BOUND_EXACT)
+    tt.store(keys[3], 0, 4, BOUND_EXACT)
+    assert tt.probe(keys[0]) == -1
+    tt.store(keys[4], 0, 5, BOUND_EXACT)
+    assert tt.probe(keys[2]) == -1
+    assert all(tt.probe(key) >= 0 for key in [keys[1], keys[3], keys[4]])
+    print("[OK] Old entry replaced before shallow new ones")
+
+    # Test 5: Hashfull counts current entries only
+    print("\n[Test 5] Checking hashfull...")
+    tt.clear()
+    assert tt.hashfull() == 0
+    for b in range(500):
+        for offset in range(CLUSTER_SIZE):
+            tt.store(bucket_key(tt, b, offset), 0, 1, BOUND_EXACT)
+    assert tt.hashfull() == 500
+    tt.new_search()
+    assert tt.hashfull() == 0
+    print("[OK] hashfull 500 then 0 after a new search")
+
+    # Test 6: Mate scores keep their distance to the root
+    print("\n[Test 6] Round-tripping mate scores...")
+    tt.clear()
+    key = keys[0]
+    for store_ply, probe_ply, mate_plies in [(0, 0, 1), (3, 7, 5), (9, 2, 4), (20, 20, 11)]:
+        for sign in (1, -1):
+            score = sign * (MATE_SCORE - (store_ply + mate_plies))
+            tt.store(key, score_to_tt(score, store_ply), 8, BOUND_EXACT)
+            probed = score_from_tt(tt.scores[tt.probe(key)], probe_ply)
+            assert probed == sign * (MATE_SCORE - (probe_ply + mate_plies)), (store_ply, probe_ply, probed)
+    for score in (0, 250, -900):
+        tt.store(key, score_to_tt(score, 5), 8, BOUND_EXACT)
+        assert score_from_tt(tt.scores[tt.probe(key)], 9) == score
+    print("[OK] Mate distances relative to the probing node")
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    test_tt()